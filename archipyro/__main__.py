@@ -1,5 +1,5 @@
 import typer
-from archipyro.cli import init, add, gen
+from archipyro.cli import init, add, gen, serve
 
 app = typer.Typer(
     name="archipyro",
@@ -10,6 +10,7 @@ app = typer.Typer(
 app.add_typer(init.app, name="init", help="Initialize a new project.")
 app.add_typer(add.app, name="add", help="Add components to the project.")
 app.add_typer(gen.app, name="gen", help="Generate infrastructure.")
+app.command(name="serve", help="Run a long-lived JSON-RPC generator over stdio or a Unix socket.")(serve.serve)
 
 if __name__ == "__main__":
     app()
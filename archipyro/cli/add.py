@@ -1,6 +1,9 @@
 import typer
+from typing import List, Optional
 from archipyro.core.config import ProjectConfig
 from archipyro.core.generator import Generator
+from archipyro.core.fields import parse_field_specs, parse_composite_indexes, parse_relation_specs
+from archipyro.core.resources import check_relation_targets
 import sys
 
 app = typer.Typer()
@@ -12,6 +15,18 @@ def get_config():
         typer.echo("Error: archipyro.json not found. Are you in the project root?")
         sys.exit(1)
 
+def get_fields(field_specs: Optional[List[str]], index_specs: Optional[List[str]]):
+    try:
+        fields = parse_field_specs(field_specs)
+        indexes = parse_composite_indexes(index_specs, fields)
+    except ValueError as e:
+        typer.echo(f"❌ {e}")
+        raise typer.Exit(1)
+    return fields, indexes
+
+FIELDS_HELP = "Field specs as name:type[:index|:unique|:optional], e.g. 'sku:str:unique price:float'."
+INDEX_HELP = "Composite index as comma-separated fields, e.g. 'name,created_at'. Repeatable."
+
 @app.command()
 def service(name: str):
     """
@@ -65,15 +80,22 @@ def repository(name: str):
     typer.echo(f"✅ Added repository: {name}")
 
 @app.command()
-def model(name: str):
+def model(
+    name: str,
+    fields: Optional[List[str]] = typer.Argument(None, help=FIELDS_HELP),
+    index: Optional[List[str]] = typer.Option(None, "--index", help=INDEX_HELP),
+):
     """
     Add a new database model.
     
     Automatically singularizes the name (e.g., 'users' -> 'User').
+    
+    Example: archipyro add model product name:str:index sku:str:unique price:float
     """
     config = get_config()
+    field_specs, indexes = get_fields(fields, index)
     generator = Generator()
-    generator.generate_model(config, name)
+    generator.generate_model(config, name, fields=field_specs, indexes=indexes)
     typer.echo(f"✅ Added model: {name}")
 
 @app.command()
@@ -142,22 +164,48 @@ def middleware(name: str):
     typer.echo(f"✅ Added middleware: {name}")
 
 @app.command()
-def resource(name: str):
+def resource(
+    name: str,
+    fields: Optional[List[str]] = typer.Argument(None, help=FIELDS_HELP),
+    index: Optional[List[str]] = typer.Option(None, "--index", help=INDEX_HELP),
+    belongs_to: Optional[List[str]] = typer.Option(None, "--belongs-to", help="Parent resource (adds a foreign key). Repeatable."),
+    has_many: Optional[List[str]] = typer.Option(None, "--has-many", help="Child resources referencing this one. Repeatable."),
+    write_behind: bool = typer.Option(False, "--write-behind", help="Add a buffered POST /ingest endpoint (202) flushed in batched INSERTs."),
+):
     """
     Add a complete resource (Model + Route + Templates).
     
     For MVC: Creates model, route, and CRUD templates.
     For Clean: Creates model, repository, service, and route.
     
-    Example: archipyro add resource product
+    Example: archipyro add resource product name:str:index sku:str:unique price:float
+    
+    Relationships: archipyro add resource order --belongs-to user --has-many items
+    (user and item must exist first, and item must belong to order)
+    
+    High-write resources: archipyro add resource event kind:str payload:text --write-behind
     """
     config = get_config()
+    field_specs, indexes = get_fields(fields, index)
+    try:
+        relations = parse_relation_specs(belongs_to, has_many, field_specs)
+    except ValueError as e:
+        typer.echo(f"❌ {e}")
+        raise typer.Exit(1)
+    problems = check_relation_targets(config, name, relations)
+    if problems:
+        for problem in problems:
+            typer.echo(f"❌ {problem}")
+        raise typer.Exit(1)
+    if write_behind and (config.architecture != "Clean Architecture" or config.database not in ["PostgreSQL", "MySQL", "SQLite"]):
+        typer.echo("❌ --write-behind is only available for Clean Architecture with a SQL database.")
+        raise typer.Exit(1)
     generator = Generator()
     
     if config.architecture == "MVC":
         typer.echo(f"🚀 Creating MVC resource: {name}")
         # Generate model
-        generator.generate_model(config, name)
+        generator.generate_model(config, name, fields=field_specs, indexes=indexes, relations=relations)
         typer.echo(f"  ✅ Model created")
         
         # Generate route
@@ -175,24 +223,31 @@ def resource(name: str):
     elif config.architecture == "Clean Architecture":
         # Clean Architecture
         typer.echo(f"🚀 Creating Clean Architecture resource: {name}")
-        generator.generate_model(config, name)
+        generator.generate_model(config, name, fields=field_specs, indexes=indexes, relations=relations)
         typer.echo(f"  ✅ Model created")
         
         if config.framework == "Flask":
-             generator.generate_view(config=config, name=name, is_resource=True)
+             generator.generate_view(config=config, name=name, is_resource=True, relations=relations, write_behind=write_behind)
              typer.echo(f"  ✅ View created")
              
-             generator.generate_form(config=config, name=name, is_resource=True)
+             generator.generate_form(config=config, name=name, is_resource=True, fields=field_specs, relations=relations)
              typer.echo(f"  ✅ Form created")
         else:
-             generator.generate_repository(config=config, name=name, is_resource=True)
+             generator.generate_schema(config=config, name=name, fields=field_specs, relations=relations)
+             typer.echo(f"  ✅ Schema created")
+
+             generator.generate_repository(config=config, name=name, is_resource=True, relations=relations, write_behind=write_behind)
              typer.echo(f"  ✅ Repository created")
              
-             generator.generate_service(config=config, name=name, is_resource=True)
+             generator.generate_service(config=config, name=name, is_resource=True, write_behind=write_behind)
              typer.echo(f"  ✅ Service created")
         
-        generator.generate_route(config=config, name=name, is_resource=True)
+        generator.generate_route(config=config, name=name, is_resource=True, write_behind=write_behind)
         typer.echo(f"  ✅ Route created")
+
+        if "Pre-configured Tests (pytest)" in config.features:
+            generator.generate_resource_tests(config=config, name=name, fields=field_specs, relations=relations)
+            typer.echo(f"  ✅ Tests created")
         
         typer.echo(f"\n✅ Resource '{name}' created successfully!")
 
@@ -203,9 +258,15 @@ def resource(name: str):
             typer.echo(f"   📁 app/routes/{name.lower()}_route.py")
         else:
             typer.echo(f"   📁 app/models/{name.lower()}.py")
+            typer.echo(f"   📁 app/schemas/{name.lower()}.py")
             typer.echo(f"   📁 app/repositories/{name.lower()}_repository.py")
             typer.echo(f"   📁 app/services/{name.lower()}_service.py")
             typer.echo(f"   📁 app/routes/{name.lower()}_route.py")
+        if "Pre-configured Tests (pytest)" in config.features:
+            typer.echo(f"   📁 tests/test_{name.lower()}.py")
+        if write_behind:
+            prefix = "/api" if config.framework == "Flask" else "/api/v1"
+            typer.echo(f"   📥 POST {prefix}/{name.lower()}/ingest buffers rows and answers 202 (see app/utils/write_behind.py)")
     else:
         typer.echo(f"❌ 'add resource' is only available for MVC or Clean Architecture.")
         raise typer.Exit(1)
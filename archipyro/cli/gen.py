@@ -1,6 +1,8 @@
 import typer
 from archipyro.core.config import ProjectConfig
 from archipyro.core.generator import Generator
+from archipyro.core.resources import find_resources
+from pathlib import Path
 import sys
 
 app = typer.Typer()
@@ -21,7 +23,7 @@ def docker():
     """
     config = get_config()
     generator = Generator()
-    generator.generate_docker(config)
+    generator.generate_docker(config, Path.cwd())
     typer.echo("Generated Docker configuration.")
 
 @app.command()
@@ -33,5 +35,23 @@ def ci():
     """
     config = get_config()
     generator = Generator()
-    generator.generate_ci(config)
+    generator.generate_ci(config, Path.cwd())
     typer.echo("Generated CI/CD workflows.")
+
+@app.command()
+def loadtest():
+    """
+    Generate a load-test driver for the registered resources.
+    
+    Creates loadtest.py, which starts the app on SQLite and reports
+    RPS and p50/p95/p99 latency as JSON.
+    """
+    config = get_config()
+    resources = find_resources(config)
+    if not resources:
+        typer.echo("Error: no registered resources found. Add one with 'archipyro add resource <name>'.")
+        sys.exit(1)
+    generator = Generator()
+    generator.generate_loadtest(config, resources, Path.cwd())
+    typer.echo(f"Generated loadtest.py for: {', '.join(resource.name for resource in resources)}")
+    typer.echo("Run it with: python loadtest.py --duration 30 --concurrency 20")
@@ -0,0 +1,22 @@
+import typer
+from typing import Optional
+from archipyro.core.server import GeneratorServer, serve_stdio, serve_unix
+
+def serve(
+    socket: Optional[str] = typer.Option(None, "--socket", help="Listen on this Unix socket instead of stdio."),
+):
+    """
+    Run a long-lived generator for editors and scripts.
+    
+    Speaks JSON-RPC 2.0, one JSON document per line, over stdio (default)
+    or a Unix socket. Methods: add, register, generate, ping, shutdown.
+    Each answer lists the changed files with unified diffs.
+    
+    Example: echo '{"jsonrpc": "2.0", "id": 1, "method": "add", "params": {"component": "resource", "name": "product", "fields": ["name:str"], "dry_run": true}}' | archipyro serve
+    """
+    server = GeneratorServer()
+    if socket:
+        typer.echo(f"Listening on {socket}", err=True)
+        serve_unix(server, socket)
+    else:
+        serve_stdio(server)
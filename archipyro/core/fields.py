@@ -0,0 +1,193 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Column/field declarations per supported field type
+FIELD_TYPES: Dict[str, Dict[str, str]] = {
+    "str": {"sqlalchemy": "String(255)", "mongoengine": "StringField", "python": "str", "wtforms": "StringField"},
+    "text": {"sqlalchemy": "Text", "mongoengine": "StringField", "python": "str", "wtforms": "TextAreaField"},
+    "int": {"sqlalchemy": "Integer", "mongoengine": "IntField", "python": "int", "wtforms": "IntegerField"},
+    "float": {"sqlalchemy": "Float", "mongoengine": "FloatField", "python": "float", "wtforms": "FloatField"},
+    "bool": {"sqlalchemy": "Boolean", "mongoengine": "BooleanField", "python": "bool", "wtforms": "BooleanField"},
+    "datetime": {"sqlalchemy": "DateTime", "mongoengine": "DateTimeField", "python": "datetime", "wtforms": "DateTimeField"},
+    "date": {"sqlalchemy": "Date", "mongoengine": "DateField", "python": "date", "wtforms": "DateField"},
+}
+
+# Python literals used by generated CRUD tests: (create payload, update payload)
+SAMPLE_VALUES: Dict[str, tuple] = {
+    "str": ("'sample'", "'updated'"),
+    "text": ("'sample text'", "'updated text'"),
+    "int": ("1", "2"),
+    "float": ("1.5", "2.5"),
+    "bool": ("True", "False"),
+    "datetime": ("'2024-01-01 12:00:00'", "'2024-02-01 12:00:00'"),
+    "date": ("'2024-01-01'", "'2024-02-01'"),
+}
+
+FIELD_MODIFIERS = ["index", "unique", "optional"]
+
+# Columns every generated model already defines
+RESERVED_FIELDS = ["id", "created_at", "updated_at"]
+
+
+@dataclass
+class FieldSpec:
+    name: str
+    type: str = "str"
+    index: bool = False
+    unique: bool = False
+    nullable: bool = False
+
+    @property
+    def sqlalchemy_type(self) -> str:
+        return FIELD_TYPES[self.type]["sqlalchemy"]
+
+    @property
+    def sqlalchemy_name(self) -> str:
+        """Importable SQLAlchemy type name, e.g. 'String' for 'String(255)'."""
+        return self.sqlalchemy_type.split("(")[0]
+
+    @property
+    def mongoengine_type(self) -> str:
+        return FIELD_TYPES[self.type]["mongoengine"]
+
+    @property
+    def mongoengine_declaration(self) -> str:
+        """Full MongoEngine field declaration, e.g. 'StringField(max_length=255, required=True)'."""
+        options = []
+        if self.type == "str":
+            options.append("max_length=255")
+        options.append(f"required={not self.nullable}")
+        if self.unique:
+            options.append("unique=True")
+        return f"{self.mongoengine_type}({', '.join(options)})"
+
+    @property
+    def python_type(self) -> str:
+        return FIELD_TYPES[self.type]["python"]
+
+    @property
+    def wtforms_type(self) -> str:
+        return FIELD_TYPES[self.type]["wtforms"]
+
+    @property
+    def is_temporal(self) -> bool:
+        return self.type in ["datetime", "date"]
+
+    @property
+    def sample_value(self) -> str:
+        """Python literal for this field in a generated create payload."""
+        return SAMPLE_VALUES[self.type][0]
+
+    @property
+    def updated_value(self) -> str:
+        """Python literal for this field in a generated update payload."""
+        return SAMPLE_VALUES[self.type][1]
+
+
+def parse_field_spec(spec: str) -> FieldSpec:
+    """
+    Parse a single 'name:type:modifier...' spec.
+
+    Example: 'sku:str:unique' -> FieldSpec(name='sku', type='str', unique=True)
+    """
+    parts = [part.strip() for part in spec.split(":")]
+    name = parts[0]
+    if not name.isidentifier():
+        raise ValueError(f"Invalid field name '{name}' in '{spec}'")
+    if name in RESERVED_FIELDS:
+        raise ValueError(f"Field '{name}' is generated automatically and cannot be redeclared")
+
+    field_type = parts[1] if len(parts) > 1 and parts[1] else "str"
+    if field_type not in FIELD_TYPES:
+        raise ValueError(f"Unknown field type '{field_type}' in '{spec}'. Must be one of: {list(FIELD_TYPES.keys())}")
+
+    field = FieldSpec(name=name, type=field_type)
+    for modifier in parts[2:]:
+        if modifier not in FIELD_MODIFIERS:
+            raise ValueError(f"Unknown field modifier '{modifier}' in '{spec}'. Must be one of: {FIELD_MODIFIERS}")
+        if modifier == "optional":
+            field.nullable = True
+        else:
+            setattr(field, modifier, True)
+    return field
+
+
+def parse_field_specs(specs: Optional[List[str]]) -> List[FieldSpec]:
+    """Parse a list of field specs, rejecting duplicate names."""
+    fields = [parse_field_spec(spec) for spec in specs or []]
+    names = [field.name for field in fields]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate field(s): {', '.join(duplicates)}")
+    return fields
+
+
+def parse_composite_indexes(specs: Optional[List[str]], fields: List[FieldSpec]) -> List[List[str]]:
+    """
+    Parse composite index specs such as 'name,created_at'.
+
+    Every column must be a declared field or a built-in timestamp column.
+    """
+    known = {field.name for field in fields} | set(RESERVED_FIELDS)
+    indexes = []
+    for spec in specs or []:
+        columns = [column.strip() for column in spec.split(",") if column.strip()]
+        if len(columns) < 2:
+            raise ValueError(f"Composite index '{spec}' needs at least two columns")
+        unknown = [column for column in columns if column not in known]
+        if unknown:
+            raise ValueError(f"Composite index '{spec}' references unknown field(s): {', '.join(unknown)}")
+        indexes.append(columns)
+    return indexes
+
+
+@dataclass
+class RelationSpec:
+    kind: str  # "belongs_to" or "has_many"
+    target: str  # singular, lower-case resource name, e.g. "user"
+
+    @property
+    def model(self) -> str:
+        return "".join(x.capitalize() for x in self.target.split("_"))
+
+    @property
+    def table(self) -> str:
+        return f"{self.target}s"
+
+    @property
+    def attribute(self) -> str:
+        return self.target if self.kind == "belongs_to" else f"{self.target}s"
+
+    @property
+    def foreign_key(self) -> str:
+        """Foreign key column; lives on this model for belongs_to, on the target for has_many."""
+        return f"{self.target}_id"
+
+
+def parse_relation_specs(belongs_to: Optional[List[str]], has_many: Optional[List[str]],
+                         fields: Optional[List[FieldSpec]] = None) -> List[RelationSpec]:
+    """
+    Parse --belongs-to/--has-many targets into relations.
+
+    Targets are singularized, so '--has-many items' targets the 'item' resource.
+    """
+    import inflect
+    p = inflect.engine()
+    relations = []
+    for kind, targets in [("belongs_to", belongs_to), ("has_many", has_many)]:
+        for target in targets or []:
+            target = target.strip().lower()
+            if not target.isidentifier():
+                raise ValueError(f"Invalid relation target '{target}'")
+            relations.append(RelationSpec(kind=kind, target=p.singular_noun(target) or target))
+    attributes = [relation.attribute for relation in relations]
+    duplicates = sorted({name for name in attributes if attributes.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate relation(s): {', '.join(duplicates)}")
+    field_names = {field.name for field in fields or []}
+    for relation in relations:
+        local = {relation.attribute, relation.foreign_key} if relation.kind == "belongs_to" else {relation.attribute}
+        clashes = field_names & local
+        if clashes:
+            raise ValueError(f"Relation '{relation.target}' clashes with declared field(s): {', '.join(sorted(clashes))}")
+    return relations
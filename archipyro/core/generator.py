@@ -1,14 +1,21 @@
 from pathlib import Path
+from typing import Dict, List, Optional
 from jinja2 import Environment, FileSystemLoader
 import inflect
 import questionary
 from archipyro.core.config import ProjectConfig
+from archipyro.core.fields import FieldSpec, RelationSpec
+from archipyro.core.resources import RegisteredResource
 
 class Generator:
-    def __init__(self):
+    def __init__(self, overwrite: Optional[bool] = None):
         self.template_dir = Path(__file__).parent.parent / "templates"
         self.env = Environment(loader=FileSystemLoader(str(self.template_dir)))
         self.p = inflect.engine()
+        # None asks before replacing an existing file; True/False decide without asking (archipyro serve)
+        self.overwrite = overwrite
+        # When set to a dict, every write records the file's previous content (None = new file)
+        self.changes: Optional[Dict[Path, Optional[str]]] = None
         
         # Register custom filters
         self.env.filters['to_pascal_case'] = self.to_pascal_case
@@ -64,6 +71,8 @@ class Generator:
             # Flask MVC Structure
             self._render_template(f"{template_base}/app/__init__.py.jinja2", app_dir / "__init__.py", config)
             self._render_template(f"{template_base}/app/config.py.jinja2", app_dir / "config.py", config)
+            self._render_template(f"{template_base}/app/cache.py.jinja2", app_dir / "cache.py", config)
+            self._render_template(f"{template_base}/app/assets.py.jinja2", app_dir / "assets.py", config)
             # Routes
             (app_dir / "routes").mkdir(exist_ok=True)
             self._render_template(f"{template_base}/app/routes/main.py.jinja2", app_dir / "routes" / "main.py", config)
@@ -78,6 +87,10 @@ class Generator:
         else:
             # FastAPI MVC Structure
             self._render_template(f"{template_base}/app/main.py.jinja2", app_dir / "main.py", config)
+            self._render_template(f"{template_base}/app/config.py.jinja2", app_dir / "config.py", config)
+            self._render_template(f"{template_base}/app/cache.py.jinja2", app_dir / "cache.py", config)
+            self._render_template(f"{template_base}/app/assets.py.jinja2", app_dir / "assets.py", config)
+            self._render_template(f"{template_base}/app/templating.py.jinja2", app_dir / "templating.py", config)
             (app_dir / "routers").mkdir(exist_ok=True)
             self._render_template(f"{template_base}/app/routers/main.py.jinja2", app_dir / "routers" / "main.py", config)
             (app_dir / "routers" / "__init__.py").touch()
@@ -88,6 +101,7 @@ class Generator:
             (app_dir / "models" / "__init__.py").touch()
 
         # Common files for MVC
+        self._render_template("shared/build_assets.py.jinja2", project_dir / "build_assets.py", config)
         self._render_template(f"{template_base}/requirements.txt.jinja2", project_dir / "requirements.txt", config)
         self._render_template(f"{template_base}/README.md.jinja2", project_dir / "README.md", config)
         self._render_template("shared/.env.jinja2", project_dir / ".env", config)
@@ -190,6 +204,16 @@ class Generator:
             # Create response utility
             self._render_template(f"{template_base}/app/utils/response.py.jinja2", app_dir / "utils" / "response.py", config)
 
+            if "Rate Limiting" in config.features:
+                self._render_template(f"{template_base}/app/middleware/rate_limit.py.jinja2", app_dir / "middleware" / "rate_limit.py", config)
+
+            # Boot phase timings, connection warm-up and health probes
+            self._render_template(f"{template_base}/app/utils/startup.py.jinja2", app_dir / "utils" / "startup.py", config)
+            self._render_template(f"{template_base}/app/routes/health.py.jinja2", app_dir / "routes" / "health.py", config)
+
+            # ETag/conditional request and compression hook
+            self._render_template(f"{template_base}/app/middleware/http_cache.py.jinja2", app_dir / "middleware" / "http_cache.py", config)
+
             # Create __init__.py in subdirectories
             for subdir in ["models", "views", "forms", "middleware", "utils", "exceptions"]:
                 (app_dir / subdir / "__init__.py").touch()
@@ -208,6 +232,15 @@ class Generator:
             self._render_template(f"{template_base}/app/core/config.py.jinja2", app_dir / "core" / "config.py", config)
             (app_dir / "core" / "__init__.py").touch()
 
+            # ETag/conditional request middleware (gzip comes from Starlette)
+            self._render_template(f"{template_base}/app/core/http_cache.py.jinja2", app_dir / "core" / "http_cache.py", config)
+
+            if "Rate Limiting" in config.features:
+                self._render_template(f"{template_base}/app/core/rate_limit.py.jinja2", app_dir / "core" / "rate_limit.py", config)
+
+            # Boot phase timings, connection warm-up and readiness
+            self._render_template(f"{template_base}/app/core/startup.py.jinja2", app_dir / "core" / "startup.py", config)
+
             # FastAPI Dependencies
             # Database dependency (always created since database is required)
             self._render_template(f"{template_base}/app/dependencies/db.py.jinja2", app_dir / "dependencies" / "db.py", config)
@@ -228,6 +261,13 @@ class Generator:
         else:
             raise ValueError(f"Unsupported framework: {config.framework}")
 
+        # Test suite: session-scoped schema, per-test SAVEPOINT rollback, per-xdist-worker database
+        if "Pre-configured Tests (pytest)" in config.features:
+            (project_dir / "tests").mkdir(exist_ok=True)
+            (project_dir / "tests" / "__init__.py").touch()
+            self._render_template(f"{template_base}/tests/conftest.py.jinja2", project_dir / "tests" / "conftest.py", config)
+            self._render_template("shared/pytest.ini.jinja2", project_dir / "pytest.ini", config)
+
         # Environment files
         self._render_template("shared/.env.jinja2", project_dir / ".env", config)
         
@@ -236,10 +276,9 @@ class Generator:
             self._render_template("shared/.env.docker.jinja2", project_dir / ".env.docker", config)
             self.generate_docker(config, project_dir)
 
-        # Generate Migrations if Alembic selected and SQL DB
+        # Alembic environment; migrations run from the one-shot `migrate` compose service, never at app boot
         if "Alembic / DB Migrations" in config.features and config.database in ["PostgreSQL", "MySQL", "SQLite"]:
-            (project_dir / "migrations").mkdir(exist_ok=True)
-            # In a real scenario, we might init alembic here or just create the folder
+            self.generate_migrations(config, project_dir)
 
         # Generate CI if selected
         if "GitHub Actions CI" in config.features:
@@ -261,6 +300,9 @@ class Generator:
 
         # Create utils/email.py
         self._render_template(f"{template_base}/app/utils/email.py.jinja2", app_dir / "utils" / "email.py", config)
+
+        # Streaming export helpers used by resource /export endpoints
+        self._ensure_export_utils(config, app_dir)
         
         # Generate Celery guide if Celery is enabled
         if "Celery / RQ Background Tasks" in config.features:
@@ -271,57 +313,160 @@ class Generator:
 
     def _render_template(self, template_name: str, output_path: Path, config: ProjectConfig, **kwargs):
         if output_path.exists():
-            should_overwrite = questionary.confirm(f"File {output_path} already exists. Overwrite?").ask()
+            should_overwrite = self.overwrite
+            if should_overwrite is None:
+                should_overwrite = questionary.confirm(f"File {output_path} already exists. Overwrite?").ask()
             if not should_overwrite:
                 print(f"Skipping {output_path}")
                 return
 
         template = self.env.get_template(template_name)
         content = template.render(config=config, **kwargs)
-        output_path.write_text(content)
+        # Resource files may target folders the project skeleton did not create (e.g. app/repositories)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._write(output_path, content)
         # print(f"Created {output_path}")
 
-    def generate_service(self, config: ProjectConfig, name: str, is_resource: bool = False):
+    def _write(self, path: Path, content: str):
+        if self.changes is not None and path not in self.changes:
+            self.changes[path] = path.read_text() if path.exists() else None
+        path.write_text(content)
+
+    def warm_up(self) -> int:
+        """Compile every template up front; returns how many compiled."""
+        compiled = 0
+        for name in self.env.list_templates(filter_func=lambda name: name.endswith(".jinja2")):
+            try:
+                self.env.get_template(name)
+                compiled += 1
+            except Exception:
+                # A broken template should only fail the request that renders it
+                pass
+        return compiled
+
+    def generate_service(self, config: ProjectConfig, name: str, is_resource: bool = False, write_behind: bool = False):
         if config.framework == "Flask" and config.architecture == "Clean Architecture":
              print("Services are not used in this architecture. Use Views instead.")
              return
         name_singular = self.p.singular_noun(name) or name
         template_path = f"{config.framework.lower()}/clean/service.py.jinja2"
         output_path = Path.cwd() / "app" / "services" / f"{name_singular.lower()}_service.py"
-        self._render_template(template_path, output_path, config, name=name_singular, is_resource=is_resource)
+        self._render_template(template_path, output_path, config, name=name_singular, is_resource=is_resource,
+                              write_behind=write_behind)
 
-    def generate_repository(self, config: ProjectConfig, name: str, is_resource: bool = False):
+    def generate_repository(self, config: ProjectConfig, name: str, is_resource: bool = False,
+                            relations: Optional[List[RelationSpec]] = None, write_behind: bool = False):
         if config.framework == "Flask" and config.architecture == "Clean Architecture":
              print("Repositories are not used in this architecture. Use Models directly in Views.")
              return
         name_singular = self.p.singular_noun(name) or name
-        template_path = f"{config.framework.lower()}/clean/repository.py.jinja2"
+        if config.database == "MongoDB":
+            template_path = f"{config.framework.lower()}/clean/repository_mongodb.py.jinja2"
+        else:
+            template_path = f"{config.framework.lower()}/clean/repository.py.jinja2"
         output_path = Path.cwd() / "app" / "repositories" / f"{name_singular.lower()}_repository.py"
-        self._render_template(template_path, output_path, config, name=name_singular, is_resource=is_resource)
+        self._render_template(template_path, output_path, config, name=name_singular, is_resource=is_resource,
+                              relations=relations or [], write_behind=write_behind)
 
-    def generate_model(self, config: ProjectConfig, name: str, is_resource: bool = False):
+    def generate_model(self, config: ProjectConfig, name: str, is_resource: bool = False,
+                       fields: Optional[List[FieldSpec]] = None, indexes: Optional[List[List[str]]] = None,
+                       relations: Optional[List[RelationSpec]] = None):
         name_singular = self.p.singular_noun(name) or name
         # Use MongoDB-specific template if MongoDB is selected
-        if config.database == "MongoDB":
+        if config.framework == "FastAPI" and config.database == "MongoDB" and "Async MongoDB Driver" in config.features:
+            template_path = "fastapi/clean/model_mongodb_async.py.jinja2"
+        elif config.database == "MongoDB":
             template_path = f"{config.framework.lower()}/clean/model_mongodb.py.jinja2"
         else:
             template_path = f"{config.framework.lower()}/clean/model.py.jinja2"
         output_path = Path.cwd() / "app" / "models" / f"{name_singular.lower()}.py"
-        self._render_template(template_path, output_path, config, name=name_singular, is_resource=is_resource)
+        self._render_template(template_path, output_path, config, name=name_singular, is_resource=is_resource,
+                              fields=fields or [], indexes=indexes or [], relations=relations or [])
 
-    def generate_route(self, config: ProjectConfig, name: str, is_resource: bool = False):
+    def generate_route(self, config: ProjectConfig, name: str, is_resource: bool = False, write_behind: bool = False):
         name_singular = self.p.singular_noun(name) or name
         if config.framework == "Flask":
             template_path = "flask/clean/route.py.jinja2"
             output_path = Path.cwd() / "app" / "routes" / f"{name_singular.lower()}.py"
+        elif config.database == "MongoDB":
+            template_path = "fastapi/clean/router_mongodb.py.jinja2"
+            output_path = Path.cwd() / "app" / "routes" / f"{name_singular.lower()}.py"
         else:
             template_path = "fastapi/clean/router.py.jinja2"
             output_path = Path.cwd() / "app" / "routes" / f"{name_singular.lower()}.py"
-        self._render_template(template_path, output_path, config, name=name_singular, is_resource=is_resource)
+        self._render_template(template_path, output_path, config, name=name_singular, is_resource=is_resource,
+                              write_behind=write_behind)
+        if is_resource:
+            self._ensure_export_utils(config, Path.cwd() / "app")
+        if write_behind:
+            self._ensure_write_behind_utils(config, Path.cwd() / "app")
         
         # Register the new route in the main app file
         self.register_route(config, name_singular)
 
+    def _ensure_export_utils(self, config: ProjectConfig, app_dir: Path):
+        """Render app/utils/export.py unless the project already has it."""
+        export_path = app_dir / "utils" / "export.py"
+        if not export_path.exists():
+            export_path.parent.mkdir(parents=True, exist_ok=True)
+            self._render_template("shared/export.py.jinja2", export_path, config)
+
+    def _ensure_write_behind_utils(self, config: ProjectConfig, app_dir: Path):
+        """
+        Add write-behind support the first time a `--write-behind` resource is generated.
+
+        Renders app/utils/write_behind.py and adds its WRITE_BEHIND_* settings to the
+        project config; FastAPI projects also get the shutdown flush in the lifespan.
+        """
+        write_behind_path = app_dir / "utils" / "write_behind.py"
+        if not write_behind_path.exists():
+            write_behind_path.parent.mkdir(parents=True, exist_ok=True)
+            self._render_template(f"{config.framework.lower()}/clean/app/utils/write_behind.py.jinja2",
+                                  write_behind_path, config)
+
+        if config.framework == "Flask":
+            settings = self.env.get_template("flask/clean/config/write_behind_settings.py.jinja2").render(config=config)
+            self._insert_into(app_dir / "config" / "base.py", "    @staticmethod", settings + "\n\n",
+                              marker="WRITE_BEHIND_MAX_SIZE")
+        else:
+            settings = self.env.get_template("fastapi/clean/app/core/write_behind_settings.py.jinja2").render(config=config)
+            self._insert_into(app_dir / "core" / "config.py", "    model_config", settings + "\n\n",
+                              marker="WRITE_BEHIND_MAX_SIZE", before_comment=True)
+            main_file = app_dir / "main.py"
+            self._insert_into(main_file, "from app.dependencies.db import", "from app.utils.write_behind import close_writers\n",
+                              marker="import close_writers", after_line=True)
+            self._insert_into(main_file, "    warm_up_task.cancel()",
+                              "    # Rows accepted by write-behind /ingest endpoints are written before exit\n"
+                              "    await close_writers()\n",
+                              marker="await close_writers()", after_line=True)
+
+    def _insert_into(self, path: Path, anchor: str, text: str, marker: str,
+                     after_line: bool = False, before_comment: bool = False):
+        """
+        Insert text at the line starting with anchor, unless marker shows it is already there.
+
+        Args:
+            after_line: Insert after the anchor line instead of before it
+            before_comment: Insert above the comment lines directly preceding the anchor
+        """
+        if not path.exists():
+            return
+        content = path.read_text()
+        if marker in content:
+            return
+        lines = content.splitlines(keepends=True)
+        index = next((i for i, line in enumerate(lines) if line.startswith(anchor)), None)
+        if index is None:
+            print(f"Could not find '{anchor.strip()}' in {path}; add this manually:\n{text}")
+            return
+        if after_line:
+            index += 1
+        elif before_comment:
+            while index > 0 and lines[index - 1].lstrip().startswith("#"):
+                index -= 1
+        lines.insert(index, text)
+        self._write(path, "".join(lines))
+
 
     def generate_docker(self, config: ProjectConfig, project_dir: Path):
         # Docker files
@@ -329,27 +474,45 @@ class Generator:
             self._render_template("shared/Dockerfile.jinja2", project_dir / "Dockerfile", config)
             self._render_template("shared/docker-compose.yml.jinja2", project_dir / "docker-compose.yml", config)
             self._render_template("shared/.dockerignore.jinja2", project_dir / ".dockerignore", config)
-            # Add docker-entrypoint script for automatic migrations
-            self._render_template("shared/docker-entrypoint.sh.jinja2", project_dir / "docker-entrypoint.sh", config)
-            # Make entrypoint executable
-            import stat
-            entrypoint_path = project_dir / "docker-entrypoint.sh"
-            entrypoint_path.chmod(entrypoint_path.stat().st_mode | stat.S_IEXEC)
+
+    def generate_migrations(self, config: ProjectConfig, project_dir: Path):
+        migrations_dir = project_dir / "migrations"
+        (migrations_dir / "versions").mkdir(parents=True, exist_ok=True)
+        (migrations_dir / "versions" / ".gitkeep").touch()
+        # Flask-Migrate expects alembic.ini inside migrations/; plain Alembic looks in the project root
+        ini_path = migrations_dir / "alembic.ini" if config.framework == "Flask" else project_dir / "alembic.ini"
+        self._render_template("shared/migrations/alembic.ini.jinja2", ini_path, config)
+        self._render_template("shared/migrations/env.py.jinja2", migrations_dir / "env.py", config)
+        self._render_template("shared/migrations/script.py.mako.jinja2", migrations_dir / "script.py.mako", config)
 
     def generate_ci(self, config: ProjectConfig, project_dir: Path):
         github_dir = project_dir / ".github" / "workflows"
         github_dir.mkdir(parents=True, exist_ok=True)
         self._render_template("shared/ci.yml.jinja2", github_dir / "ci.yml", config)
 
-    def generate_schema(self, config: ProjectConfig, name: str):
+    def generate_resource_tests(self, config: ProjectConfig, name: str, fields: Optional[List[FieldSpec]] = None,
+                                relations: Optional[List[RelationSpec]] = None):
+        name_singular = self.p.singular_noun(name) or name
+        template_path = f"{config.framework.lower()}/clean/tests/test_resource.py.jinja2"
+        output_path = Path.cwd() / "tests" / f"test_{name_singular.lower()}.py"
+        self._render_template(template_path, output_path, config, name=name_singular, fields=fields or [],
+                              relations=relations or [])
+
+    def generate_loadtest(self, config: ProjectConfig, resources: List[RegisteredResource], project_dir: Path):
+        self._render_template("shared/loadtest.py.jinja2", project_dir / "loadtest.py", config, resources=resources)
+
+    def generate_schema(self, config: ProjectConfig, name: str, fields: Optional[List[FieldSpec]] = None,
+                        relations: Optional[List[RelationSpec]] = None):
         name_singular = self.p.singular_noun(name) or name
         if config.framework == "FastAPI":
              template_path = "fastapi/clean/schema.py.jinja2"
              output_path = Path.cwd() / "app" / "schemas" / f"{name_singular.lower()}.py"
              (Path.cwd() / "app" / "schemas").mkdir(exist_ok=True)
-             self._render_template(template_path, output_path, config, name=name_singular)
+             self._render_template(template_path, output_path, config, name=name_singular, fields=fields or [],
+                                   relations=relations or [])
 
-    def generate_view(self, config: ProjectConfig, name: str, is_resource: bool = False):
+    def generate_view(self, config: ProjectConfig, name: str, is_resource: bool = False,
+                      relations: Optional[List[RelationSpec]] = None, write_behind: bool = False):
         name_singular = self.p.singular_noun(name) or name
         # Use MongoDB-specific template if MongoDB is selected
         if config.database == "MongoDB":
@@ -357,13 +520,16 @@ class Generator:
         else:
             template_path = f"{config.framework.lower()}/clean/view.py.jinja2"
         output_path = Path.cwd() / "app" / "views" / f"{name_singular.lower()}.py"
-        self._render_template(template_path, output_path, config, name=name_singular, is_resource=is_resource)
+        self._render_template(template_path, output_path, config, name=name_singular, is_resource=is_resource,
+                              relations=relations or [], write_behind=write_behind)
 
-    def generate_form(self, config: ProjectConfig, name: str, is_resource: bool = False):
+    def generate_form(self, config: ProjectConfig, name: str, is_resource: bool = False,
+                      fields: Optional[List[FieldSpec]] = None, relations: Optional[List[RelationSpec]] = None):
         name_singular = self.p.singular_noun(name) or name
         template_path = f"{config.framework.lower()}/clean/form.py.jinja2"
         output_path = Path.cwd() / "app" / "forms" / f"{name_singular.lower()}.py"
-        self._render_template(template_path, output_path, config, name=name_singular, is_resource=is_resource)
+        self._render_template(template_path, output_path, config, name=name_singular, is_resource=is_resource,
+                              fields=fields or [], relations=relations or [])
 
     def generate_middleware(self, config: ProjectConfig, name: str):
         name_singular = self.p.singular_noun(name) or name
@@ -371,23 +537,29 @@ class Generator:
         output_path = Path.cwd() / "app" / "middleware" / f"{name_singular.lower()}.py"
         self._render_template(template_path, output_path, config, name=name_singular)
 
-    def generate_resource(self, config: ProjectConfig, name: str):
+    def generate_resource(self, config: ProjectConfig, name: str,
+                          fields: Optional[List[FieldSpec]] = None, indexes: Optional[List[List[str]]] = None,
+                          relations: Optional[List[RelationSpec]] = None, write_behind: bool = False):
         name_singular = self.p.singular_noun(name) or name
-        self.generate_model(config, name_singular, is_resource=True)
+        self.generate_model(config, name_singular, is_resource=True, fields=fields, indexes=indexes, relations=relations)
         
         if config.framework == "Flask" and config.architecture == "Clean Architecture":
              # Use Views and Forms for Flask Clean
-             self.generate_view(config, name_singular)
-             self.generate_form(config, name_singular)
+             self.generate_view(config, name_singular, is_resource=True, relations=relations, write_behind=write_behind)
+             self.generate_form(config, name_singular, is_resource=True, fields=fields, relations=relations)
         else:
              # Use Service/Repository for others
-             self.generate_repository(config, name_singular, is_resource=True)
-             self.generate_service(config, name_singular, is_resource=True)
+             self.generate_repository(config, name_singular, is_resource=True, relations=relations,
+                                      write_behind=write_behind)
+             self.generate_service(config, name_singular, is_resource=True, write_behind=write_behind)
              
-        self.generate_route(config, name_singular, is_resource=True)
+        self.generate_route(config, name_singular, is_resource=True, write_behind=write_behind)
         
         if config.framework == "FastAPI":
-            self.generate_schema(config, name_singular)
+            self.generate_schema(config, name_singular, fields=fields, relations=relations)
+
+        if "Pre-configured Tests (pytest)" in config.features:
+            self.generate_resource_tests(config, name_singular, fields=fields, relations=relations)
 
     def register_route(self, config: ProjectConfig, name: str):
         """
@@ -413,7 +585,7 @@ class Generator:
             register_line = f"api_bp.register_blueprint({name_lower}_bp, url_prefix='/{name_lower}')\n"
             
             # Insert at the end of the file
-            routes_init.write_text(content + import_line + register_line)
+            self._write(routes_init, content + import_line + register_line)
             print(f"Registered blueprint {name_lower}_bp in app/routes/__init__.py")
 
         else:
@@ -432,6 +604,6 @@ class Generator:
             import_stmt = f"\nfrom app.routes.{name_lower} import router as {name_lower}_router"
             reg_stmt = f"\napp.include_router({name_lower}_router, prefix='/api/v1/{name_lower}', tags=['{name_lower}'])"
             
-            main_file.write_text(content + import_stmt + reg_stmt)
+            self._write(main_file, content + import_stmt + reg_stmt)
             print(f"Registered router {name_lower}_router in app/main.py")
 
@@ -0,0 +1,130 @@
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from archipyro.core.config import ProjectConfig
+from archipyro.core.fields import RelationSpec
+
+# Registration lines written by Generator.register_route
+FLASK_REGISTRATION = re.compile(r"api_bp\.register_blueprint\((\w+)_bp, url_prefix='([^']+)'\)")
+FASTAPI_REGISTRATION = re.compile(r"app\.include_router\((\w+)_router, prefix='([^']+)'")
+
+# Input declarations in generated forms (Flask) and schemas (FastAPI)
+WTFORMS_FIELD = re.compile(r"^\s+(\w+) = (\w+)Field\(", re.MULTILINE)
+PYDANTIC_FIELD = re.compile(r"^\s+(\w+): (?:Optional\[)?(\w+)", re.MULTILINE)
+
+# The reference a belongs_to relation declares in the target's model, per model template
+REFERENCE_DECLARATIONS = {
+    "sql": r"^\s+{name}_id = (?:db\.)?Column\(",
+    "mongoengine": r"^\s+{name} = LazyReferenceField\(",
+    "async_mongodb": r'^\s+"{name}",  # ObjectId of the ',
+}
+
+# Declared input type -> payload value kind understood by the load driver
+INPUT_KINDS = {
+    "String": "str", "TextArea": "str", "str": "str",
+    "Integer": "int", "int": "int",
+    "Float": "float", "float": "float",
+    "Boolean": "bool", "bool": "bool",
+    "DateTime": "datetime", "datetime": "datetime",
+    "Date": "date", "date": "date",
+}
+
+
+@dataclass
+class RegisteredResource:
+    name: str
+    path: str  # full URL prefix, e.g. '/api/product'
+    fields: Dict[str, str] = field(default_factory=dict)  # input field -> value kind
+
+
+def find_registered_routes(config: ProjectConfig, project_dir: Optional[Path] = None) -> List[Tuple[str, str]]:
+    """
+    List (name, URL prefix) pairs registered in app/routes/__init__.py (Flask)
+    or app/main.py (FastAPI).
+    """
+    project_dir = project_dir or Path.cwd()
+    if config.framework == "Flask":
+        registry = project_dir / "app" / "routes" / "__init__.py"
+        pattern, mount = FLASK_REGISTRATION, "/api"
+    else:
+        registry = project_dir / "app" / "main.py"
+        pattern, mount = FASTAPI_REGISTRATION, ""
+    if not registry.exists():
+        return []
+    return [(name, mount + prefix) for name, prefix in pattern.findall(registry.read_text())]
+
+
+def find_resources(config: ProjectConfig, project_dir: Optional[Path] = None) -> List[RegisteredResource]:
+    """
+    List registered routes that expose full CRUD, with the input fields a
+    create request needs.
+    """
+    project_dir = project_dir or Path.cwd()
+    resources = []
+    for name, prefix in find_registered_routes(config, project_dir):
+        route_file = project_dir / "app" / "routes" / f"{name}.py"
+        if not route_file.exists():
+            continue
+        content = route_file.read_text()
+        if "methods=['POST']" not in content and "@router.post(" not in content:
+            continue
+        resources.append(RegisteredResource(name=name, path=prefix.rstrip("/"),
+                                            fields=_input_fields(config, project_dir, name)))
+    return resources
+
+
+def _input_fields(config: ProjectConfig, project_dir: Path, name: str) -> Dict[str, str]:
+    if config.framework == "Flask":
+        source = project_dir / "app" / "forms" / f"{name}.py"
+        if not source.exists():
+            return {}
+        declarations = [(field_name, kind) for field_name, kind in WTFORMS_FIELD.findall(source.read_text())
+                        if kind != "Submit"]
+    else:
+        source = project_dir / "app" / "schemas" / f"{name}.py"
+        if not source.exists():
+            return {}
+        # Only the <Name>Base class describes the create payload
+        match = re.search(r"^class \w+Base\(BaseModel\):\n(.*?)(?=^class |\Z)", source.read_text(),
+                          re.MULTILINE | re.DOTALL)
+        declarations = PYDANTIC_FIELD.findall(match.group(1)) if match else []
+
+    fields = {}
+    for field_name, declared in declarations:
+        kind = INPUT_KINDS.get(declared, "str")
+        if config.database == "MongoDB" and field_name.endswith("_id"):
+            kind = "objectid"
+        fields[field_name] = kind
+    return fields
+
+
+def check_relation_targets(config: ProjectConfig, name: str, relations: List[RelationSpec],
+                           project_dir: Optional[Path] = None) -> List[str]:
+    """
+    Reasons the relations cannot be generated yet; empty when they can.
+
+    A model imports every model it relates to, so each target must already
+    exist, and a has_many target must already belong to `name`: otherwise the
+    app fails to import or its mappers fail to configure.
+    """
+    import inflect
+    name = (inflect.engine().singular_noun(name) or name).lower()
+    project_dir = project_dir or Path.cwd()
+    if config.database != "MongoDB":
+        declaration = REFERENCE_DECLARATIONS["sql"]
+    elif config.framework == "FastAPI" and "Async MongoDB Driver" in config.features:
+        declaration = REFERENCE_DECLARATIONS["async_mongodb"]
+    else:
+        declaration = REFERENCE_DECLARATIONS["mongoengine"]
+    reference = re.compile(declaration.format(name=re.escape(name)), re.MULTILINE)
+    problems = []
+    for relation in relations:
+        model_file = project_dir / "app" / "models" / f"{relation.target}.py"
+        if not model_file.exists():
+            problems.append(f"'{relation.target}' has no model yet; add it first: archipyro add resource {relation.target}")
+        elif relation.kind == "has_many" and not reference.search(model_file.read_text()):
+            problems.append(f"'{relation.target}' does not belong to '{name}'; "
+                            f"add it first: archipyro add resource {relation.target} --belongs-to {name}")
+    return problems
@@ -0,0 +1,306 @@
+"""
+Long-lived generator process for editors and scripts (`archipyro serve`).
+
+Speaks JSON-RPC 2.0, one JSON document per line, over stdio or a Unix
+socket. A batch (JSON array) of requests is answered with one array. The
+Generator, its compiled templates and every parsed archipyro.json stay in
+memory between requests, so only the first call pays for imports and
+template compilation.
+
+Methods:
+    ping                        -> "pong"
+    add(component, name, ...)   -> {"files": [...], "messages": [...]}
+    register(name)              -> {"files": [...], "messages": [...]}
+    generate(target)            -> {"files": [...], "messages": [...]}
+    shutdown                    -> null, then the server exits
+
+Every method except ping/shutdown takes `project` (defaults to the server's
+working directory), `overwrite` (default false: existing files are skipped,
+never prompted for) and `dry_run` (generate into a temporary copy of the
+project, report the diffs, then discard the copy).
+"""
+import contextlib
+import difflib
+import inspect
+import io
+import json
+import os
+import shutil
+import socketserver
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from archipyro.core.config import ProjectConfig
+from archipyro.core.fields import parse_field_specs, parse_composite_indexes, parse_relation_specs
+from archipyro.core.generator import Generator
+from archipyro.core.resources import check_relation_targets, find_resources
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+GENERATION_ERROR = -32000
+
+COMPONENTS = ["model", "resource", "route", "service", "repository", "view", "form", "middleware"]
+TARGETS = ["docker", "ci", "loadtest"]
+
+# Left out of the dry-run copy: generation never reads them
+STAGING_IGNORE = shutil.ignore_patterns(".git", ".venv", "venv", "node_modules", "__pycache__", "*.pyc")
+
+
+class RPCError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class GeneratorServer:
+    """Dispatches JSON-RPC messages to one warm Generator."""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = (root or Path.cwd()).resolve()
+        self.generator = Generator(overwrite=False)
+        self.generator.warm_up()
+        self.running = True
+        # Generator resolves everything against the working directory, which is process-wide
+        self._lock = threading.Lock()
+        self._configs: Dict[Path, Tuple[int, ProjectConfig]] = {}
+        self._methods: Dict[str, Callable[..., Any]] = {
+            "ping": self.ping,
+            "add": self.add,
+            "register": self.register,
+            "generate": self.generate,
+            "shutdown": self.shutdown,
+        }
+
+    # Protocol
+
+    def handle_line(self, line: str) -> Optional[str]:
+        """Answer one line of input; None when nothing should be sent back (notifications only)."""
+        try:
+            message = json.loads(line)
+        except ValueError as e:
+            return json.dumps(_error(None, PARSE_ERROR, f"Parse error: {e}"))
+        if isinstance(message, list):
+            if not message:
+                return json.dumps(_error(None, INVALID_REQUEST, "Empty batch"))
+            responses = [response for response in map(self.handle_message, message) if response is not None]
+            return json.dumps(responses) if responses else None
+        response = self.handle_message(message)
+        return json.dumps(response) if response is not None else None
+
+    def handle_message(self, message: Any) -> Optional[Dict[str, Any]]:
+        if not isinstance(message, dict) or message.get("jsonrpc") != "2.0" or not isinstance(message.get("method"), str):
+            return _error(message.get("id") if isinstance(message, dict) else None, INVALID_REQUEST, "Invalid request")
+        request_id = message.get("id")
+        is_notification = "id" not in message
+        params = message.get("params") or {}
+        try:
+            method = self._methods.get(message["method"])
+            if method is None:
+                raise RPCError(METHOD_NOT_FOUND, f"Method not found: {message['method']}")
+            if not isinstance(params, dict):
+                raise RPCError(INVALID_PARAMS, "params must be an object")
+            try:
+                inspect.signature(method).bind(**params)
+            except TypeError as e:
+                raise RPCError(INVALID_PARAMS, str(e))
+            with self._lock:
+                result = method(**params)
+        except RPCError as e:
+            return None if is_notification else _error(request_id, e.code, e.message)
+        except Exception as e:
+            return None if is_notification else _error(request_id, INTERNAL_ERROR, f"{type(e).__name__}: {e}")
+        return None if is_notification else {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    # Methods
+
+    def ping(self) -> str:
+        return "pong"
+
+    def shutdown(self) -> None:
+        self.running = False
+        return None
+
+    def add(self, component: str, name: str, fields: Optional[List[str]] = None, index: Optional[List[str]] = None,
+            belongs_to: Optional[List[str]] = None, has_many: Optional[List[str]] = None,
+            write_behind: bool = False, project: Optional[str] = None, overwrite: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+        if component not in COMPONENTS:
+            raise RPCError(INVALID_PARAMS, f"Unknown component '{component}'. Choose from: {', '.join(COMPONENTS)}")
+        try:
+            field_specs = parse_field_specs(fields)
+            indexes = parse_composite_indexes(index, field_specs)
+            relations = parse_relation_specs(belongs_to, has_many, field_specs)
+        except ValueError as e:
+            raise RPCError(INVALID_PARAMS, str(e))
+
+        def run(config: ProjectConfig, generator: Generator, project_dir: Path):
+            _check_component(config, component, write_behind)
+            if component == "resource":
+                problems = check_relation_targets(config, name, relations, project_dir)
+                if problems:
+                    raise RPCError(GENERATION_ERROR, "; ".join(problems))
+            if component == "model":
+                generator.generate_model(config, name, fields=field_specs, indexes=indexes)
+            elif component == "resource":
+                generator.generate_resource(config, name, fields=field_specs, indexes=indexes, relations=relations,
+                                            write_behind=write_behind)
+            elif component == "route":
+                generator.generate_route(config=config, name=name, is_resource=False)
+            elif component == "service":
+                generator.generate_service(config, name)
+            elif component == "repository":
+                generator.generate_repository(config, name)
+            elif component == "view":
+                generator.generate_view(config=config, name=name, is_resource=False)
+            elif component == "form":
+                generator.generate_form(config=config, name=name, is_resource=False)
+            else:
+                generator.generate_middleware(config, name)
+
+        return self._run(run, project, overwrite, dry_run)
+
+    def register(self, name: str, project: Optional[str] = None, dry_run: bool = False) -> Dict[str, Any]:
+        return self._run(lambda config, generator, project_dir: generator.register_route(config, name),
+                         project, False, dry_run)
+
+    def generate(self, target: str, project: Optional[str] = None, overwrite: bool = False,
+                 dry_run: bool = False) -> Dict[str, Any]:
+        if target not in TARGETS:
+            raise RPCError(INVALID_PARAMS, f"Unknown target '{target}'. Choose from: {', '.join(TARGETS)}")
+
+        def run(config: ProjectConfig, generator: Generator, project_dir: Path):
+            if target == "docker":
+                generator.generate_docker(config, project_dir)
+            elif target == "ci":
+                generator.generate_ci(config, project_dir)
+            else:
+                resources = find_resources(config, project_dir)
+                if not resources:
+                    raise RPCError(GENERATION_ERROR, "No registered resources found")
+                generator.generate_loadtest(config, resources, project_dir)
+
+        return self._run(run, project, overwrite, dry_run)
+
+    # Helpers
+
+    def load_config(self, project_dir: Path) -> ProjectConfig:
+        """Parsed archipyro.json, re-read only when the file changes."""
+        path = project_dir / "archipyro.json"
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise RPCError(GENERATION_ERROR, f"archipyro.json not found in {project_dir}")
+        cached = self._configs.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, ProjectConfig.load(str(path)))
+            self._configs[path] = cached
+        return cached[1]
+
+    def _run(self, action: Callable[[ProjectConfig, Generator, Path], None], project: Optional[str],
+             overwrite: bool, dry_run: bool) -> Dict[str, Any]:
+        project_dir = (self.root / project).resolve() if project else self.root
+        config = self.load_config(project_dir)
+        generator = self.generator
+        output = io.StringIO()
+        previous_dir = os.getcwd()
+        with contextlib.ExitStack() as stack:
+            work_dir = project_dir
+            if dry_run:
+                # Generate into a throwaway copy, so not even an empty directory reaches the project
+                staging = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="archipyro-dry-run-"))).resolve()
+                work_dir = staging / project_dir.name
+                shutil.copytree(project_dir, work_dir, symlinks=True, ignore=STAGING_IGNORE)
+            generator.overwrite = overwrite
+            generator.changes = {}
+            try:
+                os.chdir(work_dir)
+                # Generator prints progress; on stdio that would corrupt the protocol stream
+                with contextlib.redirect_stdout(output):
+                    action(config, generator, work_dir)
+                files = _diff(generator.changes, work_dir)
+            finally:
+                os.chdir(previous_dir)
+                generator.changes, generator.overwrite = None, False
+        messages = output.getvalue().replace(str(work_dir), str(project_dir)).splitlines()
+        return {"files": files, "messages": messages, "dry_run": dry_run}
+
+
+def _check_component(config: ProjectConfig, component: str, write_behind: bool = False) -> None:
+    # Same restrictions as the matching `archipyro add` commands
+    if component in ("service", "repository"):
+        if config.architecture != "Clean Architecture" or config.framework == "Flask":
+            raise RPCError(GENERATION_ERROR, f"'add {component}' is only available for FastAPI Clean Architecture")
+    elif component in ("view", "form", "middleware"):
+        if config.framework != "Flask" or config.architecture != "Clean Architecture":
+            raise RPCError(GENERATION_ERROR, f"'add {component}' is only available for Clean Architecture of Flask")
+    elif component == "resource":
+        if config.architecture != "Clean Architecture":
+            raise RPCError(GENERATION_ERROR, "'add resource' over serve is only available for Clean Architecture")
+        if write_behind and config.database not in ["PostgreSQL", "MySQL", "SQLite"]:
+            raise RPCError(GENERATION_ERROR, "write_behind is only available with a SQL database")
+
+
+def _diff(changes: Dict[Path, Optional[str]], project_dir: Path) -> List[Dict[str, str]]:
+    files = []
+    for path, before in changes.items():
+        after = path.read_text()
+        if before == after:
+            continue
+        relative = str(path.relative_to(project_dir)) if path.is_relative_to(project_dir) else str(path)
+        diff = difflib.unified_diff(
+            (before or "").splitlines(keepends=True), after.splitlines(keepends=True),
+            fromfile="/dev/null" if before is None else f"a/{relative}", tofile=f"b/{relative}",
+        )
+        files.append({"path": relative, "status": "created" if before is None else "modified", "diff": "".join(diff)})
+    return files
+
+
+def _error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def serve_stdio(server: GeneratorServer) -> None:
+    protocol_out = sys.stdout
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        response = server.handle_line(line)
+        if response is not None:
+            protocol_out.write(response + "\n")
+            protocol_out.flush()
+        if not server.running:
+            break
+
+
+def serve_unix(server: GeneratorServer, socket_path: str) -> None:
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                response = server.handle_line(line.decode())
+                if response is not None:
+                    self.wfile.write(response.encode() + b"\n")
+                    self.wfile.flush()
+                if not server.running:
+                    threading.Thread(target=listener.shutdown, daemon=True).start()
+                    return
+
+    class Listener(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(socket_path)
+    listener = Listener(socket_path, Handler)
+    try:
+        listener.serve_forever()
+    finally:
+        listener.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(socket_path)
@@ -73,6 +73,9 @@ def ask_optional_features(architecture: str, framework: str = None, database: st
         all_features = [
             "SQLAlchemy / ORM",
             "Alembic / DB Migrations",
+            "Read Replicas",
+            "Async MongoDB Driver",
+            "Rate Limiting",
             "Redis / Cache",
             "Celery / RQ Background Tasks",
             "Mail Service",
@@ -86,14 +89,16 @@ def ask_optional_features(architecture: str, framework: str = None, database: st
     # Filter features based on database
     if database == "MongoDB":
         # Remove SQL-specific features for MongoDB
-        all_features = [f for f in all_features if f not in ["SQLAlchemy / ORM", "Alembic / DB Migrations"]]
+        all_features = [f for f in all_features if f not in ["SQLAlchemy / ORM", "Alembic / DB Migrations", "Read Replicas"]]
     
     elif database in ["PostgreSQL", "MySQL", "SQLite"]:
         # SQL databases - keep SQL features
         pass  # No filtering needed
     
-    # Filter features based on framework (if needed in future)
-    # Currently both Flask and FastAPI support the same features
+    # Filter features based on framework and database
+    if framework != "FastAPI" or database != "MongoDB":
+        # The async MongoDB driver only fits FastAPI's async routes
+        all_features = [f for f in all_features if f != "Async MongoDB Driver"]
     
     # Show filtered features to user
     return questionary.checkbox(
@@ -1,7 +1,101 @@
+import json
+import os
+import subprocess
+import sys
 import pytest
 from typer.testing import CliRunner
 from archipyro.__main__ import app
+from archipyro.core.config import ProjectConfig
+from archipyro.core.fields import parse_field_specs
+from archipyro.core.generator import Generator
 
 @pytest.fixture
 def runner():
     return CliRunner()
+
+@pytest.fixture
+def make_project(tmp_path, monkeypatch):
+    """
+    Factory for a Clean Architecture config and a Generator writing into tmp_path.
+
+    The Generator resolves paths against the working directory, so the test runs
+    from tmp_path (an empty project with an app/ package); monkeypatch restores
+    the original directory afterwards.
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "app").mkdir()
+
+    def make(framework="FastAPI", database="PostgreSQL", features=None, name="test_project"):
+        config = ProjectConfig(
+            name=name,
+            framework=framework,
+            architecture="Clean Architecture",
+            database=database,
+            features=features or []
+        )
+        return config, Generator(overwrite=True)
+    return make
+
+@pytest.fixture
+def make_resource_project(make_project, tmp_path, monkeypatch):
+    """Factory for a complete SQLite project with a registered `product` resource; returns its directory."""
+    def make(framework, features=None):
+        config, generator = make_project(framework=framework, database="SQLite", features=features, name="api_project")
+        generator.generate_project(config)
+        project_dir = tmp_path / "api_project"
+        monkeypatch.chdir(project_dir)
+        generator.generate_resource(config, "product", fields=parse_field_specs(["name:str"]))
+        return project_dir
+    return make
+
+@pytest.fixture
+def run_in_project(tmp_path):
+    """
+    Run a Python snippet inside a generated project and return the JSON it prints last.
+
+    It runs in a subprocess so the generated `app` package never enters this
+    interpreter; the project's database is a SQLite file in tmp_path.
+    """
+    def run(project_dir, script, env=None):
+        env = {
+            **os.environ,
+            "FLASK_ENV": "development",
+            "DEV_DATABASE_URL": f"sqlite:///{tmp_path / 'app.db'}",
+            "DATABASE_URL": f"sqlite:///{tmp_path / 'app.db'}",
+            **(env or {}),
+        }
+        result = subprocess.run([sys.executable, "-c", script], cwd=project_dir, env=env,
+                                capture_output=True, text=True, timeout=120)
+        assert result.returncode == 0, result.stderr
+        return json.loads(result.stdout.strip().splitlines()[-1])
+    return run
+
+@pytest.fixture
+def client_setup():
+    """
+    Per-framework preamble for run_in_project scripts.
+
+    Defines `client`, `url` (the product list endpoint) and `body(response)` for
+    the generated app, with its tables created.
+    """
+    return {
+        "Flask": (
+            "from app import create_app\n"
+            "from app.extensions import db\n"
+            "app = create_app()\n"
+            "with app.app_context():\n"
+            "    db.create_all()\n"
+            "client = app.test_client()\n"
+            "url = '/api/product/'\n"
+            "body = lambda response: response.get_data()\n"
+        ),
+        "FastAPI": (
+            "from fastapi.testclient import TestClient\n"
+            "from app.main import app\n"
+            "from app.dependencies.db import Base, engine\n"
+            "Base.metadata.create_all(bind=engine)\n"
+            "client = TestClient(app)\n"
+            "url = '/api/v1/product/'\n"
+            "body = lambda response: response.content\n"
+        ),
+    }
@@ -0,0 +1,69 @@
+import pytest
+
+CHECK = """
+import json
+from sqlalchemy.orm import Query
+
+batches = []
+yield_per = Query.yield_per
+Query.yield_per = lambda query, count: batches.append(count) or yield_per(query, count)
+
+for number in range(3):
+    client.post(url, json={"name": f"product {number}"})
+# Read each streamed body before the next request
+ndjson = client.get(url + "export")
+ndjson_lines = body(ndjson).decode().splitlines()
+csv = client.get(url + "export?format=csv")
+csv_lines = body(csv).decode().splitlines()
+print(json.dumps({
+    "ndjson": [ndjson.headers["Content-Type"], [json.loads(line)["name"] for line in ndjson_lines]],
+    "csv": [csv.headers["Content-Type"], csv.headers["Content-Disposition"], csv_lines],
+    "batches": batches,
+}))
+"""
+
+
+@pytest.mark.parametrize("framework", ["Flask", "FastAPI"])
+def test_generated_api_streams_exports_in_batches(framework, make_resource_project, run_in_project, client_setup):
+    project_dir = make_resource_project(framework)
+
+    result = run_in_project(project_dir, client_setup[framework] + CHECK)
+
+    content_type, names = result["ndjson"]
+    assert content_type.startswith("application/x-ndjson")
+    assert names == ["product 0", "product 1", "product 2"]
+    content_type, disposition, lines = result["csv"]
+    assert content_type.startswith("text/csv")
+    assert disposition.startswith("attachment")
+    assert "name" in lines[0].split(",") and len(lines) == 4
+    # Each export reads over a server-side cursor in EXPORT_BATCH_SIZE batches
+    assert result["batches"] == [1000, 1000]
+
+REPLICA_CHECK = """
+import json
+from app.utils import export
+from app.views.product import ProductView
+# One row per chunk, so the stream can be stopped halfway
+export.EXPORT_CHUNK_SIZE = 1
+for number in range(3):
+    client.post(url, json={"name": f"product {number}"})
+flags = []
+with app.test_request_context():
+    for fmt in ("ndjson", "csv"):
+        response, _ = ProductView.export_products(fmt)
+        stream = iter(response.response)
+        next(stream)
+        flags.append(db.session.info.get("use_replica"))
+        # Both a finished and an abandoned stream hand the session back to the primary
+        list(stream) if fmt == "ndjson" else response.close()
+        flags.append(db.session.info.get("use_replica"))
+print(json.dumps(flags))
+"""
+
+
+def test_generated_flask_export_restores_replica_routing(make_resource_project, run_in_project, client_setup):
+    project_dir = make_resource_project("Flask", features=["Read Replicas"])
+
+    result = run_in_project(project_dir, client_setup["Flask"] + REPLICA_CHECK)
+
+    assert result == [True, False, True, False]
@@ -0,0 +1,57 @@
+import pytest
+from archipyro.core.fields import parse_field_specs, parse_composite_indexes, parse_relation_specs
+
+def test_parse_field_specs():
+    fields = parse_field_specs(["name:str:index", "sku:str:unique", "price:float", "note:text:optional"])
+    assert [f.name for f in fields] == ["name", "sku", "price", "note"]
+    assert fields[0].index and not fields[0].unique
+    assert fields[1].unique
+    assert fields[2].type == "float"
+    assert fields[3].nullable
+
+def test_parse_field_specs_rejects_invalid():
+    with pytest.raises(ValueError):
+        parse_field_specs(["price:money"])
+    with pytest.raises(ValueError):
+        parse_field_specs(["name:str:indexed"])
+    with pytest.raises(ValueError):
+        parse_field_specs(["id:int"])
+    with pytest.raises(ValueError):
+        parse_field_specs(["name", "name:text"])
+
+def test_parse_composite_indexes():
+    fields = parse_field_specs(["name:str", "sku:str"])
+    assert parse_composite_indexes(["name,created_at"], fields) == [["name", "created_at"]]
+    with pytest.raises(ValueError):
+        parse_composite_indexes(["name,missing"], fields)
+
+def test_parse_relation_specs():
+    relations = parse_relation_specs(["users"], ["items"])
+    assert [(r.kind, r.target, r.attribute) for r in relations] == [("belongs_to", "user", "user"), ("has_many", "item", "items")]
+    assert relations[0].foreign_key == "user_id"
+    with pytest.raises(ValueError):
+        parse_relation_specs(["user"], None, parse_field_specs(["user_id:int"]))
+
+def test_generated_model_declares_indexes(tmp_path, make_project):
+    config, generator = make_project(framework="Flask", database="SQLite")
+    fields = parse_field_specs(["name:str:index", "sku:str:unique"])
+    indexes = parse_composite_indexes(["name,sku"], fields)
+
+    generator.generate_model(config, "products", fields=fields, indexes=indexes)
+
+    content = (tmp_path / "app" / "models" / "product.py").read_text()
+    assert "name = db.Column(db.String(255), nullable=False, index=True)" in content
+    assert "sku = db.Column(db.String(255), nullable=False, unique=True)" in content
+    assert "db.Index('ix_products_name_sku', 'name', 'sku')" in content
+    assert "'sku': self.sku," in content
+
+def test_generated_repository_eager_loads_relations(tmp_path, make_project):
+    config, generator = make_project(database="SQLite")
+    relations = parse_relation_specs(["user"], ["items"])
+
+    generator.generate_repository(config, "orders", is_resource=True, relations=relations)
+
+    content = (tmp_path / "app" / "repositories" / "order_repository.py").read_text()
+    assert "joinedload(Order.user)" in content
+    assert "selectinload(Order.items)" in content
+    assert "self.db.query(Order).options(*EAGER_LOADS)" in content
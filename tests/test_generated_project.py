@@ -78,3 +78,69 @@ def test_generated_fastapi_project_runs(tmp_path):
             del sys.modules["app"]
         if "app.main" in sys.modules:
             del sys.modules["app.main"]
+
+@pytest.mark.parametrize("framework", ["Flask", "FastAPI"])
+def test_generated_mvc_project_caches_pages_and_fingerprints_assets(tmp_path, framework):
+    config = ProjectConfig(
+        name="mvc_cache_test",
+        framework=framework,
+        architecture="MVC",
+        database="SQLite",
+        features=[]
+    )
+    cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        Generator(overwrite=True).generate_project(config)
+    finally:
+        os.chdir(cwd)
+
+    project_dir = tmp_path / "mvc_cache_test"
+    app_dir = project_dir / "app"
+    routes = app_dir / ("routes" if framework == "Flask" else "routers") / "main.py"
+    assert "@cached_page()" in routes.read_text()
+    assert "def invalidate(self, namespace" in (app_dir / "cache.py").read_text()
+    assert "immutable" in (app_dir / "assets.py").read_text()
+    assert "manifest.json" in (project_dir / "build_assets.py").read_text()
+    setup = (app_dir / ("__init__.py" if framework == "Flask" else "templating.py")).read_text()
+    assert "FileSystemBytecodeCache" in setup
+
+
+@pytest.mark.parametrize("framework", ["Flask", "FastAPI"])
+def test_generated_project_migrates_out_of_band(tmp_path, framework):
+    config = ProjectConfig(
+        name="migrations_test",
+        framework=framework,
+        architecture="Clean Architecture",
+        database="PostgreSQL",
+        features=["Alembic / DB Migrations", "Docker"]
+    )
+    cwd = os.getcwd()
+    os.chdir(tmp_path)
+    try:
+        Generator(overwrite=True).generate_project(config)
+    finally:
+        os.chdir(cwd)
+
+    project_dir = tmp_path / "migrations_test"
+    migrations_dir = project_dir / "migrations"
+    ini_path = migrations_dir / "alembic.ini" if framework == "Flask" else project_dir / "alembic.ini"
+    assert ini_path.exists()
+    assert (migrations_dir / "script.py.mako").exists()
+    assert (migrations_dir / "versions").is_dir()
+    env = (migrations_dir / "env.py").read_text()
+    compile(env, "env.py", "exec")
+    assert "postgresql_concurrently" in env
+    assert "autocommit_block" in env
+    assert "pg_advisory_lock" in env
+
+    compose = (project_dir / "docker-compose.yml").read_text()
+    assert "  migrate:" in compose
+    assert "service_completed_successfully" in compose
+    assert "entrypoint:" not in compose
+    assert not (project_dir / "docker-entrypoint.sh").exists()
+    if framework == "FastAPI":
+        main = (project_dir / "app" / "main.py").read_text()
+        assert main.count("from app.dependencies.db import") == 1
+        assert "init_db" not in main
+        assert "ENVIRONMENT" not in (project_dir / "app" / "core" / "config.py").read_text()
@@ -0,0 +1,65 @@
+import pytest
+
+# Warm-up fails once, then succeeds on the retry (after the 1 second backoff)
+FLAKY_WARM_UP = """
+import json
+import time
+attempts = []
+def flaky_warm_up(connections):
+    attempts.append(connections)
+    if len(attempts) == 1:
+        raise RuntimeError("database unavailable")
+    return connections
+"""
+
+SETUP = {
+    "Flask": """
+import importlib
+# app.extensions re-exports `db`, which shadows the module of the same name
+importlib.import_module("app.extensions.db").warm_up = flaky_warm_up
+from app import create_app
+client = create_app().test_client()
+report = lambda response: response.get_json()
+""",
+    "FastAPI": """
+import app.main
+from fastapi.testclient import TestClient
+app.main.warm_up = flaky_warm_up
+# Entering the client runs the lifespan, which starts warm-up
+client = TestClient(app.main.app).__enter__()
+report = lambda response: response.json()
+""",
+}
+
+CHECK = """
+live = client.get("/health/live")
+
+def wait_for(predicate):
+    for _ in range(100):
+        response = client.get("/health/ready")
+        if predicate(response):
+            return [response.status_code, report(response)]
+        time.sleep(0.05)
+failed = wait_for(lambda response: "error" in report(response))
+ready = wait_for(lambda response: response.status_code == 200)
+print(json.dumps({"failed": failed, "ready": ready, "live": live.status_code, "attempts": attempts}))
+"""
+
+
+@pytest.mark.parametrize("framework", ["Flask", "FastAPI"])
+def test_readiness_waits_for_warm_up(framework, make_resource_project, run_in_project):
+    project_dir = make_resource_project(framework)
+
+    result = run_in_project(project_dir, FLAKY_WARM_UP + SETUP[framework] + CHECK)
+
+    # Live from the start; not ready while warm-up fails
+    assert result["live"] == 200
+    status, report = result["failed"]
+    assert status == 503
+    assert report["status"] == "starting" and "RuntimeError: database unavailable" in report["error"]
+    # Ready after the retry, with every boot phase timed
+    status, report = result["ready"]
+    assert status == 200
+    assert report["status"] == "ready" and "error" not in report
+    assert {"import", "warm_up", "total"} <= set(report["phases_ms"])
+    assert len(result["attempts"]) == 2
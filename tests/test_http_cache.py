@@ -0,0 +1,35 @@
+import pytest
+
+CHECK = """
+import json
+client.post(url, json={"name": "first"})
+fresh = client.get(url)
+etag = fresh.headers["ETag"]
+cached = client.get(url, headers={"If-None-Match": etag})
+stale = client.get(url, headers={"If-None-Match": 'W/"stale"'})
+small = client.get(url, headers={"Accept-Encoding": "gzip"})
+for number in range(40):
+    client.post(url, json={"name": f"product {number}"})
+large = client.get(url, headers={"Accept-Encoding": "gzip"})
+print(json.dumps({
+    "cached": [cached.status_code, len(body(cached))],
+    "stale": [stale.status_code, stale.headers["ETag"] == etag],
+    "small": [len(body(fresh)), small.headers.get("Content-Encoding")],
+    "large": [large.headers.get("Content-Encoding"), large.status_code],
+}))
+"""
+
+@pytest.mark.parametrize("framework", ["Flask", "FastAPI"])
+def test_generated_api_answers_conditional_requests_and_compresses(framework, make_resource_project, run_in_project,
+                                                                    client_setup):
+    project_dir = make_resource_project(framework)
+
+    result = run_in_project(project_dir, client_setup[framework] + CHECK)
+
+    # Matching If-None-Match: 304 without a body
+    assert result["cached"] == [304, 0]
+    # Stale ETag: the full response again
+    assert result["stale"] == [200, True]
+    # Below COMPRESS_MIN_SIZE (1024 bytes by default) the body is sent as is
+    assert result["small"][0] < 1024 and result["small"][1] is None
+    assert result["large"] == ["gzip", 200]
@@ -0,0 +1,99 @@
+import pytest
+from archipyro.core.fields import parse_field_specs
+
+MIGRATE = {
+    "Flask": [["flask", "db", "migrate", "-m", "init"], ["flask", "db", "upgrade"],
+              ["flask", "db", "migrate", "-m", "empty"], ["flask", "db", "downgrade", "base"]],
+    "FastAPI": [["alembic", "revision", "--autogenerate", "-m", "init"], ["alembic", "upgrade", "head"],
+                ["alembic", "revision", "--autogenerate", "-m", "empty"], ["alembic", "downgrade", "base"]],
+}
+
+UPGRADE_CHECK = """
+import json, os, subprocess, sys
+from pathlib import Path
+from sqlalchemy import create_engine, inspect
+def schema():
+    engine = create_engine(os.environ["DATABASE_URL"])
+    tables = {name: sorted(index["name"] for index in inspect(engine).get_indexes(name))
+              for name in inspect(engine).get_table_names()}
+    engine.dispose()
+    return tables
+result = {}
+for args in COMMANDS:
+    subprocess.run([sys.executable, "-m", *args], check=True, capture_output=True)
+    result[args[-1]] = schema()
+result["revisions"] = len(list(Path("migrations/versions").glob("*.py")))
+print(json.dumps(result))
+"""
+
+# The Postgres env.py against SQLite: hashtext and pg_advisory_lock are stand-ins that record their calls
+ONLINE_INDEX_CHECK = """
+import json
+from pathlib import Path
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import event, text
+from sqlalchemy.pool import Pool
+from app.dependencies.db import Base, engine
+import app.models.product, app.models.order
+calls = []
+@event.listens_for(Pool, "connect")
+def postgres_functions(dbapi_connection, record):
+    dbapi_connection.create_function("hashtext", 1, lambda name: calls.append(["hashtext", name]) or 7)
+    dbapi_connection.create_function("pg_advisory_lock", 1, lambda key: calls.append(["lock", key]))
+@event.listens_for(Pool, "close")
+def closed(dbapi_connection, record):
+    calls.append(["close"])
+# products exists without its name index; orders is created by the revision
+Base.metadata.create_all(engine)
+with engine.begin() as connection:
+    connection.execute(text("DROP INDEX ix_products_name"))
+    connection.execute(text("DROP TABLE orders"))
+engine.dispose()
+calls.clear()
+command.revision(Config("alembic.ini"), message="online", autogenerate=True)
+print(json.dumps({"calls": calls, "revision": next(Path("migrations/versions").glob("*.py")).read_text()}))
+"""
+
+@pytest.mark.parametrize("framework", ["Flask", "FastAPI"])
+def test_generated_migrations_upgrade_sqlite(tmp_path, make_project, monkeypatch, run_in_project, framework):
+    config, generator = make_project(framework=framework, database="SQLite",
+                                     features=["Alembic / DB Migrations"], name="migrations_project")
+    generator.generate_project(config)
+    project_dir = tmp_path / "migrations_project"
+    monkeypatch.chdir(project_dir)
+    generator.generate_resource(config, "product", fields=parse_field_specs(["name:str:index"]))
+
+    script = f"COMMANDS = {MIGRATE[framework]!r}\n" + UPGRADE_CHECK
+    result = run_in_project(project_dir, script, env={"FLASK_APP": "app"})
+
+    assert "products" not in result["init"]
+    assert "ix_products_name" in result["upgrade" if framework == "Flask" else "head"]["products"]
+    # No schema changes: no empty revision is written
+    assert result["revisions"] == 1
+    assert list(result["base"]) == ["alembic_version"]
+
+def test_generated_postgres_migrations_build_indexes_online(tmp_path, make_project, monkeypatch, run_in_project):
+    config, generator = make_project(framework="FastAPI", database="PostgreSQL",
+                                     features=["Alembic / DB Migrations"], name="online_project")
+    generator.generate_project(config)
+    project_dir = tmp_path / "online_project"
+    monkeypatch.chdir(project_dir)
+    for name in ("product", "order"):
+        generator.generate_resource(config, name, fields=parse_field_specs(["name:str:index"]))
+
+    result = run_in_project(project_dir, ONLINE_INDEX_CHECK)
+
+    # Taken once on the migration connection, released when that connection closes at the end
+    assert result["calls"] == [["hashtext", "online_project:migrations"], ["lock", 7], ["close"]]
+    revision = result["revision"]
+    compile(revision, "revision.py", "exec")
+    assert ("    with op.get_context().autocommit_block():\n"
+            "        op.create_index(op.f('ix_products_name'), 'products', ['name'], unique=False, postgresql_concurrently=True)\n"
+            ) in revision
+    assert ("    with op.get_context().autocommit_block():\n"
+            "        op.drop_index(op.f('ix_products_name'), table_name='products', postgresql_concurrently=True)\n"
+            ) in revision
+    # The new table's indexes are built in the revision's transaction
+    assert "op.create_index(op.f('ix_orders_name'), 'orders', ['name'], unique=False)\n" in revision
+    assert revision.count("autocommit_block") == 2
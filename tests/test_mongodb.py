@@ -0,0 +1,94 @@
+import pytest
+from archipyro.core.fields import parse_field_specs, parse_relation_specs
+
+@pytest.mark.parametrize("features", [[], ["Async MongoDB Driver"]])
+def test_generated_mongodb_repository_projects_raw_documents(tmp_path, make_project, features):
+    config, generator = make_project(database="MongoDB", features=features)
+    fields = parse_field_specs(["name:str", "price:float"])
+
+    generator.generate_model(config, "orders", is_resource=True, fields=fields)
+    generator.generate_repository(config, "orders", is_resource=True)
+
+    model = (tmp_path / "app" / "models" / "order.py").read_text()
+    repository = (tmp_path / "app" / "repositories" / "order_repository.py").read_text()
+    assert "API_FIELDS = (" in model
+    if features:
+        assert "from mongoengine" not in model
+        assert "cursor = self.collection.find({}, PROJECTION)" in repository
+        assert "async def get_by_id(self, id: str)" in repository
+    else:
+        assert ".only(*API_FIELDS)" in repository
+        assert ".as_pymongo()" in repository
+
+@pytest.mark.parametrize("features", [[], ["Async MongoDB Driver"]])
+def test_generated_mongodb_repository_batches_relations(tmp_path, make_project, features):
+    config, generator = make_project(database="MongoDB", features=features)
+    fields = parse_field_specs(["email:str"])
+
+    generator.generate_schema(config, "users", fields=fields, relations=parse_relation_specs(None, ["posts"]))
+    generator.generate_repository(config, "users", is_resource=True, relations=parse_relation_specs(None, ["posts"]))
+    generator.generate_repository(config, "posts", is_resource=True, relations=parse_relation_specs(["user"], None))
+
+    schema = (tmp_path / "app" / "schemas" / "user.py").read_text()
+    users = (tmp_path / "app" / "repositories" / "user_repository.py").read_text()
+    posts = (tmp_path / "app" / "repositories" / "post_repository.py").read_text()
+    assert "posts: List[UserPostRef] = []" in schema
+    assert 'document["posts"] = posts_by_parent.get(document["id"], [])' in users
+    assert 'document["user"] = users.get(document["user_id"])' in posts
+    if features:
+        assert '.find({"_id": {"$in": user_ids}}' in posts
+        assert '{"user": {"$in": [ObjectId(document["id"]) for document in documents]}}' in users
+    else:
+        assert "User.objects(pk__in=user_ids)" in posts
+        assert "Post.objects(user__in=[ObjectId(document[\"id\"]) for document in documents])" in users
+
+def test_generated_mongodb_schema_rejects_invalid_references(tmp_path, make_project):
+    config, generator = make_project(database="MongoDB")
+    fields = parse_field_specs(["name:str"])
+
+    generator.generate_schema(config, "orders", fields=fields, relations=parse_relation_specs(["user"], None, fields))
+
+    namespace = {}
+    exec((tmp_path / "app" / "schemas" / "order.py").read_text(), namespace)
+    with pytest.raises(ValueError):
+        namespace["OrderCreate"](name="a", user_id="not-an-object-id")
+    with pytest.raises(ValueError):
+        namespace["OrderUpdate"](user_id="123")
+    assert namespace["OrderCreate"](name="a", user_id="a" * 24).user_id == "a" * 24
+
+def test_generated_mongodb_update_rejects_null_references(tmp_path, make_project):
+    config, generator = make_project(database="MongoDB")
+    fields = parse_field_specs(["name:str"])
+
+    generator.generate_schema(config, "orders", fields=fields, relations=parse_relation_specs(["user"], None, fields))
+
+    namespace = {}
+    exec((tmp_path / "app" / "schemas" / "order.py").read_text(), namespace)
+    with pytest.raises(ValueError, match="cannot be null"):
+        namespace["OrderUpdate"](user_id=None)
+    # Omitting the reference keeps the stored one
+    assert namespace["OrderUpdate"](name="b").model_dump(exclude_unset=True) == {"name": "b"}
+
+TO_MONGO = """
+import json
+from app.repositories.order_repository import _to_mongo
+print(json.dumps({
+    "null": _to_mongo({"name": "b", "user_id": None}),
+    "set": {key: str(value) for key, value in _to_mongo({"user_id": "a" * 24}).items()},
+}))
+"""
+
+def test_generated_async_mongodb_repository_never_stores_null_references(make_project, run_in_project, tmp_path,
+                                                                          monkeypatch):
+    config, generator = make_project(database="MongoDB", features=["Async MongoDB Driver"], name="api_project")
+    generator.generate_project(config)
+    project_dir = tmp_path / "api_project"
+    monkeypatch.chdir(project_dir)
+    generator.generate_resource(config, "user", fields=parse_field_specs(["email:str"]))
+    fields = parse_field_specs(["name:str"])
+    generator.generate_resource(config, "order", fields=fields, relations=parse_relation_specs(["user"], None, fields))
+
+    result = run_in_project(project_dir, TO_MONGO)
+
+    # ObjectId(None) would have stored a fresh id pointing at no user
+    assert result == {"null": {"name": "b"}, "set": {"user": "a" * 24}}
@@ -0,0 +1,72 @@
+import pytest
+from archipyro.core.config import ProjectConfig
+from archipyro.core.generator import Generator
+
+# Static files for build_assets.py: the stylesheet references the image
+STATIC = """
+import json, subprocess, sys
+from pathlib import Path
+static = Path("app/static")
+(static / "img").mkdir(parents=True)
+(static / "img" / "logo.png").write_bytes(b"logo")
+(static / "css").mkdir()
+(static / "css" / "site.css").write_text("body { background: url('../img/logo.png'); }")
+subprocess.run([sys.executable, "build_assets.py"], check=True, capture_output=True)
+manifest = json.loads((static / "dist" / "manifest.json").read_text())
+"""
+
+SETUP = {
+    "Flask": (
+        "from app import create_app\n"
+        "from app.cache import invalidate\n"
+        "app = create_app()\n"
+        "client = app.test_client()\n"
+        "with app.test_request_context():\n"
+        "    asset_url = app.jinja_env.from_string(\"{{ static_url('css/site.css') }}\").render()\n"
+        "body = lambda response: response.get_data()\n"
+    ),
+    "FastAPI": (
+        "from fastapi.testclient import TestClient\n"
+        "from app.main import app\n"
+        "from app.cache import invalidate\n"
+        "from app.templating import templates\n"
+        "client = TestClient(app)\n"
+        "asset_url = templates.env.from_string(\"{{ static_url('css/site.css') }}\").render()\n"
+        "body = lambda response: response.content\n"
+    ),
+}
+
+CHECK = """
+pages = [client.get("/") for _ in range(2)]
+# Bumps the "pages" version key: the cached entry is no longer looked up
+invalidate()
+pages += [client.get("/") for _ in range(2)]
+asset = client.get(asset_url)
+print(json.dumps({
+    "pages": [page.headers.get("X-Page-Cache") for page in pages],
+    "same_body": len({body(page) for page in pages}) == 1,
+    "manifest": manifest,
+    "asset_url": asset_url,
+    "asset": [asset.status_code, asset.headers.get("Cache-Control"), body(asset).decode()],
+}))
+"""
+
+@pytest.mark.parametrize("framework", ["Flask", "FastAPI"])
+def test_generated_mvc_pages_are_cached_and_assets_resolve_through_manifest(tmp_path, monkeypatch, run_in_project,
+                                                                            framework):
+    config = ProjectConfig(name="mvc_project", framework=framework, architecture="MVC", database="SQLite", features=[])
+    monkeypatch.chdir(tmp_path)
+    Generator(overwrite=True).generate_project(config)
+
+    result = run_in_project(tmp_path / "mvc_project", STATIC + SETUP[framework] + CHECK)
+
+    assert result["pages"] == ["MISS", "HIT", "MISS", "HIT"]
+    assert result["same_body"]
+    logo, site = result["manifest"]["img/logo.png"], result["manifest"]["css/site.css"]
+    assert logo.startswith("img/logo.") and site.startswith("css/site.")
+    assert result["asset_url"].endswith(f"/static/dist/{site}")
+    assert result["asset"] == [
+        200,
+        "public, max-age=31536000, immutable",
+        f"body {{ background: url('../{logo}'); }}",
+    ]
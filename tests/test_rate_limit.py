@@ -0,0 +1,74 @@
+import pytest
+
+MODULES = {"Flask": "app.middleware.rate_limit", "FastAPI": "app.core.rate_limit"}
+
+BUCKET_CHECK = """
+import asyncio
+import inspect
+import json
+import {module} as rate_limit
+
+clock = [1000.0]
+rate_limit.time.monotonic = lambda: clock[0]
+bucket = rate_limit.MemoryTokenBucket(rate=2, burst=3)
+
+def acquire(key="client"):
+    wait = bucket.acquire(key)
+    return asyncio.run(wait) if inspect.isawaitable(wait) else wait
+
+burst = [acquire() for _ in range(4)]
+other_client = acquire("other")
+clock[0] += 0.5
+refilled = [acquire(), acquire()]
+clock[0] += 60
+capped = [acquire() for _ in range(4)]
+print(json.dumps({{"burst": burst, "other_client": other_client, "refilled": refilled, "capped": capped}}))
+"""
+
+@pytest.mark.parametrize("framework", ["Flask", "FastAPI"])
+def test_generated_token_bucket_allows_burst_then_refills(framework, make_resource_project, run_in_project):
+    project_dir = make_resource_project(framework, features=["Rate Limiting"])
+
+    result = run_in_project(project_dir, BUCKET_CHECK.format(module=MODULES[framework]))
+
+    # rate=2/s, burst=3: three requests pass, the fourth waits for half a token-interval
+    assert result["burst"] == [0, 0, 0, 0.5]
+    assert result["other_client"] == 0
+    # Half a second refills exactly one token
+    assert result["refilled"] == [0, 0.5]
+    # A long idle period refills up to the burst, no further
+    assert result["capped"][:3] == [0, 0, 0] and result["capped"][3] > 0
+
+# Without the redis package or RATE_LIMIT_REDIS_URL, buckets must fall back to process memory
+NO_REDIS = """
+import sys
+sys.modules["redis"] = None
+"""
+
+LIMIT_CHECK = """
+import json
+from {module} import RedisTokenBucket
+responses = [client.get(url) for _ in range(3)]
+health = client.get("/health/live")
+print(json.dumps({{
+    "statuses": [response.status_code for response in responses],
+    "retry_after": responses[-1].headers.get("Retry-After"),
+    "health": health.status_code,
+}}))
+"""
+
+@pytest.mark.parametrize("framework", ["Flask", "FastAPI"])
+def test_generated_api_answers_429_with_retry_after_from_memory_buckets(framework, make_resource_project,
+                                                                        run_in_project, client_setup):
+    project_dir = make_resource_project(framework, features=["Rate Limiting", "Redis / Cache"])
+    env = {"RATE_LIMIT_RATE": "0.5", "RATE_LIMIT_BURST": "2", "RATE_LIMIT_REDIS_URL": ""}
+
+    script = NO_REDIS + client_setup[framework] + LIMIT_CHECK.format(module=MODULES[framework])
+
+    result = run_in_project(project_dir, script, env)
+
+    assert result["statuses"] == [200, 200, 429]
+    # One token at 0.5 tokens/s is two seconds away
+    assert result["retry_after"] == "2"
+    # Health probes are never limited
+    assert result["health"] == 200
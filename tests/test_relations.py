@@ -0,0 +1,80 @@
+import pytest
+from archipyro.core.fields import parse_field_specs, parse_relation_specs
+from archipyro.core.resources import check_relation_targets
+
+# Runs the generated test suite with SQLite enforcing foreign keys, as PostgreSQL and MySQL do
+RUN_TESTS = """
+import json
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+@event.listens_for(Engine, "connect")
+def enforce_foreign_keys(dbapi_connection, connection_record):
+    dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+exit_code = pytest.main(["-q", "-p", "no:cacheprovider", "tests"])
+print(json.dumps({"exit_code": int(exit_code)}))
+"""
+
+
+@pytest.mark.parametrize("framework", ["Flask", "FastAPI"])
+def test_generated_tests_create_real_parents(framework, make_project, run_in_project, tmp_path, monkeypatch):
+    config, generator = make_project(framework=framework, database="SQLite",
+                                     features=["Pre-configured Tests (pytest)"], name="api_project")
+    generator.generate_project(config)
+    project_dir = tmp_path / "api_project"
+    monkeypatch.chdir(project_dir)
+    generator.generate_resource(config, "user", fields=parse_field_specs(["email:str:unique"]))
+    fields = parse_field_specs(["name:str"])
+    generator.generate_resource(config, "order", fields=fields, relations=parse_relation_specs(["user"], None, fields))
+
+    test_order = (project_dir / "tests" / "test_order.py").read_text()
+    assert "from tests.test_user import create_user" in test_order
+
+    assert run_in_project(project_dir, RUN_TESTS) == {"exit_code": 0}
+
+@pytest.mark.parametrize("database, features", [
+    ("SQLite", []),
+    ("MongoDB", []),
+    ("MongoDB", ["Async MongoDB Driver"]),
+])
+def test_relation_targets_must_exist_and_point_back(make_project, tmp_path, database, features):
+    config, generator = make_project(database=database, features=features)
+    fields = parse_field_specs(["name:str"])
+    has_items = parse_relation_specs(None, ["items"])
+
+    assert check_relation_targets(config, "orders", has_items) == [
+        "'item' has no model yet; add it first: archipyro add resource item"
+    ]
+    generator.generate_model(config, "item", fields=fields)
+    assert check_relation_targets(config, "orders", has_items) == [
+        "'item' does not belong to 'order'; add it first: archipyro add resource item --belongs-to order"
+    ]
+    generator.generate_model(config, "item", fields=fields, relations=parse_relation_specs(["order"], None, fields))
+    assert check_relation_targets(config, "orders", has_items) == []
+    # belongs_to only needs the target's model
+    assert check_relation_targets(config, "reviews", parse_relation_specs(["item"], None)) == []
+
+CONFIGURE_MAPPERS = """
+import json
+from sqlalchemy.orm import configure_mappers
+import app.models.order
+import app.models.user
+configure_mappers()
+print(json.dumps({"users": app.models.user.User.orders.property.mapper.class_.__name__}))
+"""
+
+def test_has_many_added_after_its_belongs_to_configures(make_project, run_in_project, tmp_path, monkeypatch):
+    config, generator = make_project(database="SQLite", name="api_project")
+    generator.generate_project(config)
+    project_dir = tmp_path / "api_project"
+    monkeypatch.chdir(project_dir)
+    fields = parse_field_specs(["name:str"])
+    generator.generate_resource(config, "user", fields=fields)
+    generator.generate_resource(config, "order", fields=fields, relations=parse_relation_specs(["user"], None, fields))
+    has_orders = parse_relation_specs(None, ["orders"], fields)
+    assert check_relation_targets(config, "user", has_orders) == []
+    generator.generate_model(config, "user", fields=fields, relations=has_orders)
+
+    assert run_in_project(project_dir, CONFIGURE_MAPPERS) == {"users": "Order"}
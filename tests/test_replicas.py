@@ -0,0 +1,64 @@
+def test_generated_repository_reads_from_replica(tmp_path, make_project):
+    config, generator = make_project(features=["Read Replicas"])
+
+    generator.generate_repository(config, "orders", is_resource=True)
+
+    content = (tmp_path / "app" / "repositories" / "order_repository.py").read_text()
+    assert "self.read_db = read_db or db" in content
+    assert "return self.read_db.query(Order).offset(skip).limit(limit).all()" in content
+    assert "self.get_by_id(id, use_primary=True)" in content
+
+def test_generated_read_db_reuses_primary_session_without_replicas(tmp_path, make_project):
+    config, generator = make_project(features=["Read Replicas"], name="replica_test")
+
+    generator.generate_project(config)
+
+    content = (tmp_path / "replica_test" / "app" / "dependencies" / "db.py").read_text()
+    assert "or [SessionLocal]" not in content
+    assert "def get_read_db(db: Session = Depends(get_db)) -> Session:" in content
+    assert "db = next(_replica_sessions)()" in content
+
+POOLER_CHECK = """
+import json
+from flask import Flask
+from app.extensions.db import use_pooler
+app = Flask(__name__)
+app.config.update(
+    SQLALCHEMY_DATABASE_URI='postgresql+psycopg://app@pgbouncer:6432/app',
+    SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 20, 'pool_pre_ping': True, 'connect_args': {'connect_timeout': 5}},
+    SQLALCHEMY_BINDS={
+        'replica_0': 'postgresql+psycopg://app@replica:6432/app',
+        'replica_1': {'url': 'postgresql+psycopg2://app@replica:6432/app', 'max_overflow': 5},
+    },
+)
+use_pooler(app)
+describe = lambda options: {**options, 'poolclass': options['poolclass'].__name__}
+print(json.dumps({
+    'primary': describe(app.config['SQLALCHEMY_ENGINE_OPTIONS']),
+    'binds': {key: describe(options) for key, options in app.config['SQLALCHEMY_BINDS'].items()},
+}))
+"""
+
+def test_flask_pooler_options_merge_into_engine_options_and_binds(tmp_path, make_project, run_in_project):
+    config, generator = make_project(framework="Flask", features=["Read Replicas"], name="pooler_test")
+    generator.generate_project(config)
+
+    result = run_in_project(tmp_path / "pooler_test", POOLER_CHECK)
+
+    assert result["primary"] == {
+        "pool_pre_ping": True,
+        "poolclass": "NullPool",
+        "connect_args": {"connect_timeout": 5, "prepare_threshold": None},
+    }
+    assert result["binds"] == {
+        "replica_0": {
+            "url": "postgresql+psycopg://app@replica:6432/app",
+            "poolclass": "NullPool",
+            "connect_args": {"prepare_threshold": None},
+        },
+        "replica_1": {
+            "url": "postgresql+psycopg2://app@replica:6432/app",
+            "poolclass": "NullPool",
+            "connect_args": {},
+        },
+    }
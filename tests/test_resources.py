@@ -0,0 +1,65 @@
+import pytest
+from archipyro.core.config import ProjectConfig
+from archipyro.core.generator import Generator
+from archipyro.core.resources import find_registered_routes, find_resources
+
+# A short run of the generated driver; it starts the app itself on a throw-away SQLite database
+LOADTEST = """
+import asyncio, json
+import loadtest
+report = asyncio.run(loadtest.main(loadtest.parse_args(["--duration", "1", "--concurrency", "2", "--seed", "3"])))
+print(json.dumps({"resources": loadtest.RESOURCES, "report": report}))
+"""
+
+def test_find_resources_flask(tmp_path):
+    config = ProjectConfig(
+        name="loadtest_test",
+        framework="Flask",
+        architecture="Clean Architecture",
+        database="SQLite",
+        features=[]
+    )
+    routes = tmp_path / "app" / "routes"
+    forms = tmp_path / "app" / "forms"
+    routes.mkdir(parents=True)
+    forms.mkdir(parents=True)
+    (routes / "__init__.py").write_text(
+        "api_bp = Blueprint('api', __name__)\n"
+        "from app.routes.product import product_bp\n"
+        "api_bp.register_blueprint(product_bp, url_prefix='/product')\n"
+        "from app.routes.health import health_bp\n"
+        "api_bp.register_blueprint(health_bp, url_prefix='/health')\n"
+    )
+    (routes / "product.py").write_text("@product_bp.route('/', methods=['POST'])\n")
+    (routes / "health.py").write_text("@health_bp.route('/', methods=['GET'])\n")
+    (forms / "product.py").write_text(
+        "class ProductForm(FlaskForm):\n"
+        "    name = StringField('Name', validators=[DataRequired()])\n"
+        "    price = FloatField('Price', validators=[DataRequired()])\n"
+        "    user_id = IntegerField('User', validators=[DataRequired()])\n"
+        "    submit = SubmitField('Submit')\n"
+    )
+
+    assert find_registered_routes(config, tmp_path) == [("product", "/api/product"), ("health", "/api/health")]
+    resources = find_resources(config, tmp_path)
+    assert [resource.name for resource in resources] == ["product"]
+    assert resources[0].fields == {"name": "str", "price": "float", "user_id": "int"}
+
+@pytest.mark.parametrize("framework", ["Flask", "FastAPI"])
+def test_generated_loadtest_runs_against_generated_app(framework, make_resource_project, run_in_project):
+    project_dir = make_resource_project(framework)
+    config = ProjectConfig.load("archipyro.json")
+    Generator(overwrite=True).generate_loadtest(config, find_resources(config), project_dir)
+
+    result = run_in_project(project_dir, LOADTEST)
+
+    path = "/api/product" if framework == "Flask" else "/api/v1/product"
+    assert result["resources"] == [{"name": "product", "path": path, "fields": {"name": "str"}}]
+    report = result["report"]
+    assert report["resources"] == ["product"]
+    assert report["total"]["requests"] > 0
+    assert report["total"]["errors"] == 0
+    assert 0 < report["total"]["p50_ms"] <= report["total"]["p99_ms"]
+    assert set(report["operations"]) <= {"product.list", "product.get", "product.create", "product.update"}
+    assert "product.list" in report["operations"]
+    assert not (project_dir / "loadtest.db").exists()
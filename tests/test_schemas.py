@@ -0,0 +1,62 @@
+from archipyro.core.fields import parse_field_specs, parse_relation_specs
+
+def test_generated_schema_is_pydantic_v2_native(tmp_path, make_project):
+    config, generator = make_project()
+    fields = parse_field_specs(["name:str", "price:float"])
+
+    generator.generate_schema(config, "orders", fields=fields)
+
+    content = (tmp_path / "app" / "schemas" / "order.py").read_text()
+    assert "orm_mode" not in content
+    assert "model_config = ConfigDict(from_attributes=True)" in content
+    assert "OrderList = TypeAdapter(List[Order])" in content
+
+# The list endpoint next to the response_model serialization it replaced, on the same rows
+LIST_CHECK = """
+import json
+from typing import List
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from app.main import app
+from app.dependencies.db import Base, engine, get_db
+from app.repositories.product_repository import ProductRepository
+from app.schemas.product import Product
+
+@app.get("/response-model/product/", response_model=List[Product])
+def response_model_products(db=Depends(get_db)):
+    return ProductRepository(db).get_all()
+
+Base.metadata.create_all(bind=engine)
+client = TestClient(app)
+user = client.post("/api/v1/user/", json={"email": "ada@example.com"}).json()
+client.post("/api/v1/product/", json={"name": "lamp", "price": 9.5, "created": "2024-05-01T12:30:00",
+                                      "active": True, "user_id": user["id"]})
+client.post("/api/v1/product/", json={"name": "desk", "price": 120, "created": "2024-05-02T08:00:00",
+                                      "active": False, "note": "oak", "user_id": user["id"]})
+listed = client.get("/api/v1/product/")
+print(json.dumps({
+    "content_type": listed.headers["Content-Type"],
+    "listed": listed.json(),
+    "response_model": client.get("/response-model/product/").json(),
+}))
+"""
+
+def test_generated_list_endpoint_matches_response_model_serialization(tmp_path, make_project, monkeypatch,
+                                                                      run_in_project):
+    config, generator = make_project(database="SQLite", name="schema_project")
+    generator.generate_project(config)
+    project_dir = tmp_path / "schema_project"
+    monkeypatch.chdir(project_dir)
+    generator.generate_resource(config, "user", fields=parse_field_specs(["email:str"]))
+    fields = parse_field_specs(["name:str", "price:float", "created:datetime", "active:bool", "note:text:optional"])
+    generator.generate_resource(config, "product", fields=fields, relations=parse_relation_specs(["user"], None, fields))
+
+    result = run_in_project(project_dir, LIST_CHECK)
+
+    assert result["content_type"] == "application/json"
+    assert result["listed"] == result["response_model"]
+    first, second = result["listed"]
+    assert first["price"] == 9.5 and first["created"] == "2024-05-01T12:30:00" and first["note"] is None
+    assert second["note"] == "oak" and second["active"] is False
+    # Nested relation fields come through the TypeAdapter too
+    assert first["user"] == second["user"] == {"id": first["user_id"]}
@@ -0,0 +1,73 @@
+import json
+from archipyro.core.config import ProjectConfig
+from archipyro.core.server import GeneratorServer, GENERATION_ERROR, INTERNAL_ERROR, INVALID_PARAMS, METHOD_NOT_FOUND
+
+def make_project(tmp_path):
+    config = ProjectConfig(
+        name="serve_test",
+        framework="FastAPI",
+        architecture="Clean Architecture",
+        database="SQLite",
+        features=[]
+    )
+    config.save(str(tmp_path / "archipyro.json"))
+    main = tmp_path / "app" / "main.py"
+    main.parent.mkdir(parents=True)
+    main.write_text("app = FastAPI()\n")
+    return main
+
+def call(server, method, **params):
+    return json.loads(server.handle_line(json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params})))
+
+def test_serve_batch_returns_diffs_and_dry_run_leaves_project_untouched(tmp_path):
+    main = make_project(tmp_path)
+
+    server = GeneratorServer(root=tmp_path)
+    add = {"component": "resource", "name": "products", "fields": ["name:str", "price:float"]}
+    batch = [
+        {"jsonrpc": "2.0", "id": 1, "method": "add", "params": dict(add, dry_run=True)},
+        {"jsonrpc": "2.0", "id": 2, "method": "nope"},
+        {"jsonrpc": "2.0", "method": "ping"},
+    ]
+    dry, missing = json.loads(server.handle_line(json.dumps(batch)))
+
+    files = {f["path"]: f for f in dry["result"]["files"]}
+    assert files["app/models/product.py"]["status"] == "created"
+    assert files["app/main.py"]["status"] == "modified"
+    assert "+app.include_router(product_router" in files["app/main.py"]["diff"]
+    assert missing["error"]["code"] == METHOD_NOT_FOUND
+    # Dry run leaves the project untouched
+    assert main.read_text() == "app = FastAPI()\n"
+    assert sorted(path.name for path in tmp_path.rglob("*")) == ["app", "archipyro.json", "main.py"]
+
+    real = json.loads(server.handle_line(json.dumps({"jsonrpc": "2.0", "id": 3, "method": "add", "params": add})))
+    assert (tmp_path / "app" / "models" / "product.py").exists()
+    assert len(real["result"]["files"]) == len(dry["result"]["files"])
+
+    # Existing files are skipped instead of prompting
+    again = json.loads(server.handle_line(json.dumps({"jsonrpc": "2.0", "id": 4, "method": "add", "params": add})))
+    assert again["result"]["files"] == []
+
+def test_serve_separates_bad_params_from_internal_errors(tmp_path, monkeypatch):
+    make_project(tmp_path)
+    server = GeneratorServer(root=tmp_path)
+
+    assert call(server, "add", component="route")["error"]["code"] == INVALID_PARAMS
+    assert call(server, "ping", project=".")["error"]["code"] == INVALID_PARAMS
+
+    # A TypeError raised while generating is a bug, not a bad request
+    def broken(*args, **kwargs):
+        raise TypeError("unsupported operand")
+    monkeypatch.setattr(server.generator, "generate_route", broken)
+    error = call(server, "add", component="route", name="status")["error"]
+    assert error == {"code": INTERNAL_ERROR, "message": "TypeError: unsupported operand"}
+
+def test_serve_refuses_relations_to_missing_models(tmp_path):
+    make_project(tmp_path)
+    server = GeneratorServer(root=tmp_path)
+
+    response = call(server, "add", component="resource", name="orders", fields=["name:str"], has_many=["items"])
+
+    assert response["error"] == {"code": GENERATION_ERROR,
+                                 "message": "'item' has no model yet; add it first: archipyro add resource item"}
+    assert not (tmp_path / "app" / "models").exists()
@@ -0,0 +1,197 @@
+import pytest
+from archipyro.core.fields import parse_field_specs
+
+@pytest.mark.parametrize("framework", ["Flask", "FastAPI"])
+def test_generated_write_behind_resource_buffers_ingest(tmp_path, make_project, framework):
+    config, generator = make_project(framework=framework)
+    fields = parse_field_specs(["kind:str", "value:float"])
+    app_dir = tmp_path / "app"
+    if framework == "Flask":
+        settings_path = app_dir / "config" / "base.py"
+        settings_path.parent.mkdir()
+        settings_path.write_text("class Config:\n    DEBUG = False\n\n    @staticmethod\n    def init_app(app):\n        pass\n")
+    else:
+        settings_path = app_dir / "core" / "config.py"
+        settings_path.parent.mkdir()
+        settings_path.write_text('class Settings(BaseSettings):\n    DEBUG: bool = False\n\n    model_config = SettingsConfigDict(env_file=".env")\n')
+        (app_dir / "main.py").write_text("from app.dependencies.db import init_db, warm_up\n\nasync def lifespan(app):\n    yield\n    warm_up_task.cancel()\n")
+
+    generator.generate_resource(config, "events", fields=fields, write_behind=True)
+    # A second write-behind resource reuses the utility and settings
+    generator.generate_resource(config, "metrics", fields=fields, write_behind=True)
+
+    route = (app_dir / "routes" / "event.py").read_text()
+    writer = (app_dir / "utils" / "write_behind.py").read_text()
+    assert "/ingest" in route
+    assert "class WriteBehindWriter" in writer
+    assert settings_path.read_text().count("# Write-behind ingestion") == 1
+    if framework == "Flask":
+        view = (app_dir / "views" / "event.py").read_text()
+        assert "db.session.execute(insert(Event), rows)" in view
+        assert "event_writer.submit(rows)" in view
+    else:
+        assert "status_code=202" in route
+        assert "self.db.execute(insert(Event), rows)" in (app_dir / "repositories" / "event_repository.py").read_text()
+        assert 'event_writer = WriteBehindWriter("event", _insert_events)' in (app_dir / "services" / "event_service.py").read_text()
+        main = (app_dir / "main.py").read_text()
+        assert main.count("await close_writers()") == 1
+        assert "from app.utils.write_behind import close_writers" in main
+
+def test_generated_project_has_no_write_behind_until_requested(tmp_path, make_project):
+    config, generator = make_project(name="plain_test")
+
+    generator.generate_project(config)
+
+    project = tmp_path / "plain_test"
+    assert not (project / "app" / "utils" / "write_behind.py").exists()
+    assert "WRITE_BEHIND" not in (project / "app" / "core" / "config.py").read_text()
+    assert "close_writers" not in (project / "app" / "main.py").read_text()
+
+SETUP = {
+    "Flask": """
+from app import create_app
+from app.extensions import db
+from app.models.event import Event
+from app.views.event import event_writer as writer
+app = create_app()
+with app.app_context():
+    db.create_all()
+    # Creates the buffer; the flusher thread only wakes on submit() or every WRITE_BEHIND_FLUSH_INTERVAL
+    writer._start()
+call = lambda value: value
+size = lambda: len(writer.buffer)
+
+def count():
+    with app.app_context():
+        return Event.query.count()
+""",
+    "FastAPI": """
+import asyncio
+from app.dependencies.db import Base, SessionLocal, engine
+from app.models.event import Event
+from app.services.event_service import event_writer as writer
+Base.metadata.create_all(bind=engine)
+call = asyncio.new_event_loop().run_until_complete
+size = lambda: call(writer.buffer.size())
+
+def count():
+    with SessionLocal() as db:
+        return db.query(Event).count()
+""",
+}
+
+CHECK = """
+import json
+import logging
+from sqlalchemy.exc import OperationalError
+
+dead_letters = []
+class DeadLetters(logging.Handler):
+    def emit(self, record):
+        dead_letters.append(json.loads(record.getMessage())["row"]["kind"])
+dead_letter_logger = logging.getLogger("app.utils.write_behind.dead_letter")
+dead_letter_logger.addHandler(DeadLetters())
+dead_letter_logger.propagate = False
+
+batches, outages = [], []
+insert_many = writer.insert_many
+def insert(rows):
+    batches.append(len(rows))
+    if outages:
+        outages.pop()
+        raise OperationalError("INSERT", {}, Exception("connection refused"))
+    insert_many(rows)
+writer.insert_many = insert
+rows = lambda *kinds: [{"kind": kind, "value": 1.0} for kind in kinds]
+result = {}
+
+call(writer.buffer.put(rows("a", "b", "c", "d", "e")))
+result["batching"] = [call(writer.flush()), batches[:], count()]
+
+batches.clear()
+outages.append(True)
+call(writer.buffer.put(rows("f", "g")))
+try:
+    call(writer.flush())
+except OperationalError:
+    result["requeue"] = [size()]
+result["requeue"] += [call(writer.flush()), count()]
+
+batches.clear()
+call(writer.buffer.put(rows("h", None, "i")))
+result["dead_letter"] = [call(writer.flush()), batches[:], count(), dead_letters[:]]
+
+call(writer.submit(rows("j")))
+call(writer.close())
+result["close"] = [count(), size()]
+print(json.dumps(result))
+"""
+
+# The worker thread never returns; close() must give up after its timeout
+STUCK_CLOSE = """
+import asyncio
+import json
+import logging
+import time
+from app.services.event_service import event_writer as writer
+
+dead_letters = []
+class DeadLetters(logging.Handler):
+    def emit(self, record):
+        dead_letters.append(json.loads(record.getMessage())["error"])
+dead_letter_logger = logging.getLogger("app.utils.write_behind.dead_letter")
+dead_letter_logger.addHandler(DeadLetters())
+dead_letter_logger.propagate = False
+
+writer.insert_many = lambda rows: time.sleep(3)
+
+async def main():
+    await writer.submit([{"kind": "a", "value": 1.0}, {"kind": "b", "value": 1.0}])
+    await asyncio.sleep(0.1)
+    await writer.submit([{"kind": "c", "value": 1.0}])
+    started = time.monotonic()
+    await writer.close(timeout=0.5)
+    return time.monotonic() - started
+
+print(json.dumps({"elapsed": asyncio.new_event_loop().run_until_complete(main()), "dead_letters": dead_letters}))
+"""
+
+@pytest.fixture
+def make_write_behind_project(make_project, tmp_path, monkeypatch):
+    """Factory for a complete SQLite project with an `event` resource generated with --write-behind."""
+    def make(framework):
+        config, generator = make_project(framework=framework, database="SQLite", name="api_project")
+        generator.generate_project(config)
+        project_dir = tmp_path / "api_project"
+        monkeypatch.chdir(project_dir)
+        generator.generate_resource(config, "events", fields=parse_field_specs(["kind:str", "value:float"]),
+                                    write_behind=True)
+        return project_dir
+    return make
+
+@pytest.mark.parametrize("framework", ["Flask", "FastAPI"])
+def test_write_behind_batches_requeues_and_dead_letters(framework, make_write_behind_project, run_in_project):
+    project_dir = make_write_behind_project(framework)
+
+    result = run_in_project(project_dir, SETUP[framework] + CHECK,
+                            env={"WRITE_BEHIND_BATCH_SIZE": "2", "WRITE_BEHIND_FLUSH_INTERVAL": "60"})
+
+    # Five rows in INSERTs of at most WRITE_BEHIND_BATCH_SIZE
+    assert result["batching"] == [5, [2, 2, 1], 5]
+    # Database unreachable: the batch goes back to the buffer, then is written exactly once
+    assert result["requeue"] == [2, 2, 7]
+    # A rejected batch is retried row by row; only the row the database refuses is dead-lettered
+    assert result["dead_letter"] == [2, [2, 1, 1, 1], 9, [None]]
+    # close() writes what is left
+    assert result["close"] == [10, 0]
+
+def test_write_behind_close_is_bounded_by_its_timeout(make_write_behind_project, run_in_project):
+    project_dir = make_write_behind_project("FastAPI")
+
+    result = run_in_project(project_dir, STUCK_CLOSE,
+                            env={"WRITE_BEHIND_BATCH_SIZE": "2", "WRITE_BEHIND_FLUSH_INTERVAL": "60"})
+
+    assert result["elapsed"] < 2
+    # The batch in flight may still land; the row never taken was not written
+    assert result["dead_letters"] == ["flush cancelled at shutdown, the row may have been written"] * 2 + [
+        "not written before shutdown"]